@@ -0,0 +1,139 @@
+"""initial schema
+
+The schema exactly as `create_all` created it at import time before migrations were
+introduced. Databases created that way are adopted with `alembic stamp 0001` followed
+by `alembic upgrade head`, which applies every later change.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 10:14:01.708452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('locations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_locations_id'), 'locations', ['id'], unique=False)
+    op.create_index(op.f('ix_locations_name'), 'locations', ['name'], unique=True)
+
+    op.create_table('materials',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('quantity', sa.Float(), nullable=True),
+    sa.Column('unit', sa.String(), nullable=True),
+    sa.Column('reorder_point', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_materials_id'), 'materials', ['id'], unique=False)
+    op.create_index(op.f('ix_materials_name'), 'materials', ['name'], unique=True)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=True),
+    sa.Column('role', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+
+    op.create_table('products',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=True),
+    sa.Column('price', sa.Float(), nullable=True),
+    sa.Column('location_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_products_id'), 'products', ['id'], unique=False)
+    op.create_index(op.f('ix_products_name'), 'products', ['name'], unique=True)
+
+    op.create_table('bill_of_materials',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('material_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['material_id'], ['materials.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('product_id', 'material_id', name='uix_product_material')
+    )
+    op.create_index(op.f('ix_bill_of_materials_id'), 'bill_of_materials', ['id'], unique=False)
+
+    op.create_table('production_orders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('batch_size', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('PLANNED', 'IN_PROGRESS', 'COMPLETE', name='productionstatus'), nullable=True),
+    sa.Column('note', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_production_orders_id'), 'production_orders', ['id'], unique=False)
+
+    op.create_table('inventory_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('material_id', sa.Integer(), nullable=False),
+    sa.Column('production_order_id', sa.Integer(), nullable=True),
+    sa.Column('change_type', sa.Enum('RESTOCK', 'DEDUCTION', name='changetype'), nullable=False),
+    sa.Column('quantity', sa.Float(), nullable=False),
+    sa.Column('remaining', sa.Float(), nullable=False),
+    sa.Column('note', sa.String(), nullable=True),
+    sa.Column('timestamp', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['material_id'], ['materials.id'], ),
+    sa.ForeignKeyConstraint(['production_order_id'], ['production_orders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_inventory_logs_id'), 'inventory_logs', ['id'], unique=False)
+
+    op.create_table('production_audit_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('production_order_id', sa.Integer(), nullable=False),
+    sa.Column('action', sa.String(), nullable=False),
+    sa.Column('note', sa.String(), nullable=True),
+    sa.Column('timestamp', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['production_order_id'], ['production_orders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_production_audit_logs_id'), 'production_audit_logs', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('production_audit_logs')
+    op.drop_table('inventory_logs')
+    op.drop_table('production_orders')
+    op.drop_table('bill_of_materials')
+    op.drop_table('products')
+    op.drop_table('users')
+    op.drop_table('materials')
+    op.drop_table('locations')
+    # PostgreSQL keeps enum types after their tables are dropped
+    sa.Enum(name="changetype").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="productionstatus").drop(op.get_bind(), checkfirst=True)
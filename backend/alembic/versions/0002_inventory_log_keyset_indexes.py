@@ -0,0 +1,33 @@
+"""inventory log keyset indexes
+
+Composite indexes behind the keyset-paginated, filtered GET /logs/inventory/.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 14:02:11.406218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_inventory_logs_change_type_timestamp', 'inventory_logs', ['change_type', 'timestamp', 'id'], unique=False)
+    op.create_index('ix_inventory_logs_material_timestamp', 'inventory_logs', ['material_id', 'timestamp', 'id'], unique=False)
+    op.create_index('ix_inventory_logs_timestamp_id', 'inventory_logs', ['timestamp', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inventory_logs_timestamp_id', table_name='inventory_logs')
+    op.drop_index('ix_inventory_logs_material_timestamp', table_name='inventory_logs')
+    op.drop_index('ix_inventory_logs_change_type_timestamp', table_name='inventory_logs')
@@ -0,0 +1,56 @@
+"""material low stock flag
+
+Adds the maintained materials.is_low_stock flag and its crossing timestamp, backfilled
+from the current quantities so materials already below their reorder point are listed
+by /materials/low_stock/ right away.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 14:04:37.912655
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('materials', sa.Column('is_low_stock', sa.Boolean(), nullable=True))
+    op.add_column('materials', sa.Column('low_stock_changed_at', sa.DateTime(), nullable=True))
+
+    # Same rule as the ORM hook: missing values count as 0. Rows that start out low are
+    # stamped so `changed_since` readers pick them up.
+    materials = sa.table(
+        'materials',
+        sa.column('quantity', sa.Float()),
+        sa.column('reorder_point', sa.Float()),
+        sa.column('is_low_stock', sa.Boolean()),
+        sa.column('low_stock_changed_at', sa.DateTime()),
+    )
+    is_low = sa.func.coalesce(materials.c.quantity, 0.0) < sa.func.coalesce(materials.c.reorder_point, 0.0)
+    op.execute(materials.update().values(is_low_stock=False))
+    op.execute(materials.update().where(is_low).values(is_low_stock=True, low_stock_changed_at=datetime.utcnow()))
+
+    with op.batch_alter_table('materials') as batch_op:
+        batch_op.alter_column('is_low_stock', existing_type=sa.Boolean(), nullable=False)
+    op.create_index('ix_materials_low_stock', 'materials', ['id'], unique=False, postgresql_where=sa.text('is_low_stock'), sqlite_where=sa.text('is_low_stock'))
+    op.create_index(op.f('ix_materials_low_stock_changed_at'), 'materials', ['low_stock_changed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_materials_low_stock_changed_at'), table_name='materials')
+    op.drop_index('ix_materials_low_stock', table_name='materials', postgresql_where=sa.text('is_low_stock'), sqlite_where=sa.text('is_low_stock'))
+    with op.batch_alter_table('materials') as batch_op:
+        batch_op.drop_column('low_stock_changed_at')
+        batch_op.drop_column('is_low_stock')
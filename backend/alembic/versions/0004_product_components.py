@@ -0,0 +1,45 @@
+"""product components
+
+Product-to-product components, the sub-assembly edges of multi-level BoMs.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 14:06:02.554190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('product_components',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('component_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['component_id'], ['products.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('product_id', 'component_id', name='uix_product_component')
+    )
+    op.create_index(op.f('ix_product_components_component_id'), 'product_components', ['component_id'], unique=False)
+    op.create_index(op.f('ix_product_components_id'), 'product_components', ['id'], unique=False)
+    op.create_index(op.f('ix_product_components_product_id'), 'product_components', ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_product_components_product_id'), table_name='product_components')
+    op.drop_index(op.f('ix_product_components_id'), table_name='product_components')
+    op.drop_index(op.f('ix_product_components_component_id'), table_name='product_components')
+    op.drop_table('product_components')
@@ -0,0 +1,43 @@
+"""stock snapshots
+
+Per-material stock snapshots used to answer point-in-time (`as_of`) stock reads.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 10:16:08.547062
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('material_id', sa.Integer(), nullable=False),
+    sa.Column('taken_at', sa.DateTime(), nullable=False),
+    sa.Column('quantity', sa.Float(), nullable=False),
+    sa.Column('last_log_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['material_id'], ['materials.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('material_id', 'taken_at', name='uix_stock_snapshot_material_taken_at')
+    )
+    op.create_index(op.f('ix_stock_snapshots_id'), 'stock_snapshots', ['id'], unique=False)
+    op.create_index('ix_stock_snapshots_taken_at_material', 'stock_snapshots', ['taken_at', 'material_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_stock_snapshots_taken_at_material', table_name='stock_snapshots')
+    op.drop_index(op.f('ix_stock_snapshots_id'), table_name='stock_snapshots')
+    op.drop_table('stock_snapshots')
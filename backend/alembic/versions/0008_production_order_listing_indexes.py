@@ -0,0 +1,38 @@
+"""production order listing indexes
+
+Keyset and filter indexes for GET /production_orders/, plus a partial index on open orders.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 10:27:08.645988
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_production_orders_completed_at', 'production_orders', ['completed_at'], unique=False)
+    op.create_index('ix_production_orders_created_at_id', 'production_orders', ['created_at', 'id'], unique=False)
+    op.create_index('ix_production_orders_open', 'production_orders', ['created_at', 'id'], unique=False, postgresql_where=sa.text("status IN ('PLANNED', 'IN_PROGRESS')"), sqlite_where=sa.text("status IN ('PLANNED', 'IN_PROGRESS')"))
+    op.create_index('ix_production_orders_product_created_at', 'production_orders', ['product_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_production_orders_status_created_at', 'production_orders', ['status', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_production_orders_status_created_at', table_name='production_orders')
+    op.drop_index('ix_production_orders_product_created_at', table_name='production_orders')
+    op.drop_index('ix_production_orders_open', table_name='production_orders', postgresql_where=sa.text("status IN ('PLANNED', 'IN_PROGRESS')"), sqlite_where=sa.text("status IN ('PLANNED', 'IN_PROGRESS')"))
+    op.drop_index('ix_production_orders_created_at_id', table_name='production_orders')
+    op.drop_index('ix_production_orders_completed_at', table_name='production_orders')
@@ -0,0 +1,116 @@
+"""inventory log partitions and daily aggregates
+
+Monthly range partitions for inventory_logs on PostgreSQL, and the daily aggregates
+that old ledger months are rolled up into.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 10:32:22.841479
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOG_INDEXES = {
+    'ix_inventory_logs_change_type_timestamp': ['change_type', 'timestamp', 'id'],
+    'ix_inventory_logs_id': ['id'],
+    'ix_inventory_logs_material_timestamp': ['material_id', 'timestamp', 'id'],
+    'ix_inventory_logs_timestamp_id': ['timestamp', 'id'],
+}
+
+
+def _log_columns():
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('inventory_logs_id_seq'::regclass)"), nullable=False),
+        sa.Column('material_id', sa.Integer(), nullable=False),
+        sa.Column('production_order_id', sa.Integer(), nullable=True),
+        sa.Column('change_type', postgresql.ENUM('RESTOCK', 'DEDUCTION', name='changetype', create_type=False), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.Column('remaining', sa.Float(), nullable=False),
+        sa.Column('note', sa.String(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['material_id'], ['materials.id'], ),
+        sa.ForeignKeyConstraint(['production_order_id'], ['production_orders.id'], ),
+    ]
+
+
+def _replace_log_table(primary_key: list[str], **table_kw) -> None:
+    # Swap inventory_logs for a new table of the given shape, keeping rows and the id sequence
+    op.execute("ALTER SEQUENCE inventory_logs_id_seq OWNED BY NONE")
+    for name in LOG_INDEXES:
+        op.drop_index(name, table_name='inventory_logs')
+    op.execute("ALTER TABLE inventory_logs RENAME TO inventory_logs_old")
+    op.execute("ALTER TABLE inventory_logs_old RENAME CONSTRAINT inventory_logs_pkey TO inventory_logs_old_pkey")
+    op.create_table('inventory_logs', *_log_columns(), sa.PrimaryKeyConstraint(*primary_key), **table_kw)
+    for name, columns in LOG_INDEXES.items():
+        op.create_index(name, 'inventory_logs', columns, unique=False)
+
+
+def _copy_old_rows() -> None:
+    op.execute("INSERT INTO inventory_logs SELECT * FROM inventory_logs_old")
+    op.drop_table('inventory_logs_old')
+    op.execute("ALTER SEQUENCE inventory_logs_id_seq OWNED BY inventory_logs.id")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('inventory_daily_aggregates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('material_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('restocked', sa.Float(), nullable=False),
+    sa.Column('deducted', sa.Float(), nullable=False),
+    sa.Column('closing_balance', sa.Float(), nullable=False),
+    sa.Column('entries', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['material_id'], ['materials.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('material_id', 'day', name='uix_inventory_daily_material_day')
+    )
+    op.create_index(op.f('ix_inventory_daily_aggregates_id'), 'inventory_daily_aggregates', ['id'], unique=False)
+
+    # The partition key cannot be NULL; rows written before the default existed get epoch 0
+    op.execute("UPDATE inventory_logs SET timestamp = '1970-01-01' WHERE timestamp IS NULL")
+
+    if op.get_bind().dialect.name != 'postgresql':
+        with op.batch_alter_table('inventory_logs') as batch_op:
+            batch_op.alter_column('timestamp', existing_type=sa.DateTime(), nullable=False)
+        return
+
+    # A partitioned table's primary key must include the partition column
+    _replace_log_table(['id', 'timestamp'], postgresql_partition_by='RANGE (timestamp)')
+    op.execute("CREATE TABLE inventory_logs_default PARTITION OF inventory_logs DEFAULT")
+    first = op.get_bind().scalar(sa.text("SELECT min(timestamp) FROM inventory_logs_old WHERE timestamp > '1970-01-01'"))
+    month = date(first.year, first.month, 1) if first else date.today().replace(day=1)
+    today = date.today()
+    while month <= today:
+        following = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+        op.execute(
+            f"CREATE TABLE inventory_logs_y{month.year:04d}m{month.month:02d} PARTITION OF inventory_logs "
+            f"FOR VALUES FROM ('{month}') TO ('{following}')"
+        )
+        month = following
+    _copy_old_rows()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        _replace_log_table(['id'])
+        _copy_old_rows()
+        op.alter_column('inventory_logs', 'timestamp', existing_type=sa.DateTime(), nullable=True)
+    else:
+        with op.batch_alter_table('inventory_logs') as batch_op:
+            batch_op.alter_column('timestamp', existing_type=sa.DateTime(), nullable=True)
+    op.drop_index(op.f('ix_inventory_daily_aggregates_id'), table_name='inventory_daily_aggregates')
+    op.drop_table('inventory_daily_aggregates')
@@ -0,0 +1,53 @@
+"""daily aggregates maintained on write
+
+Backfills inventory_daily_aggregates from the ledger rows still retained, now that the
+aggregates are updated with every ledger write instead of by the rollup.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 10:35:07.123387
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_inventory_daily_aggregates_day_material', 'inventory_daily_aggregates', ['day', 'material_id'], unique=False)
+    # Days still in the ledger were never rolled up, so they are not aggregated yet
+    op.execute("""
+        INSERT INTO inventory_daily_aggregates (material_id, day, restocked, deducted, closing_balance, entries)
+        SELECT totals.material_id, totals.day, totals.restocked, totals.deducted, last.remaining, totals.entries
+        FROM (
+            SELECT material_id, date(timestamp) AS day,
+                   sum(CASE WHEN change_type = 'RESTOCK' THEN quantity ELSE 0 END) AS restocked,
+                   sum(CASE WHEN change_type = 'DEDUCTION' THEN quantity ELSE 0 END) AS deducted,
+                   count(*) AS entries, max(id) AS last_id
+            FROM inventory_logs
+            GROUP BY material_id, date(timestamp)
+        ) AS totals
+        JOIN inventory_logs AS last ON last.id = totals.last_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Back to rollup-maintained aggregates: forget days the ledger still holds
+    op.execute("""
+        DELETE FROM inventory_daily_aggregates
+        WHERE EXISTS (
+            SELECT 1 FROM inventory_logs
+            WHERE inventory_logs.material_id = inventory_daily_aggregates.material_id
+              AND date(inventory_logs.timestamp) = inventory_daily_aggregates.day
+        )
+    """)
+    op.drop_index('ix_inventory_daily_aggregates_day_material', table_name='inventory_daily_aggregates')
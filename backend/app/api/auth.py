@@ -1,22 +1,46 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from app.db.database import get_db, run_db
 from app.models.user import User
-from app.schemas.auth import UserCreate, UserRead, Token
-from app.services.auth_utils import hash_password, verify_password, create_access_token
+from app.schemas.auth import UserCreate, UserRead, Token, RefreshRequest
+from app.services.auth_utils import (
+    PasswordHasherBusy,
+    create_access_token,
+    hash_password_async,
+    verify_password_async
+)
+from app.services.refresh_tokens import (
+    RefreshTokenError,
+    issue_refresh_token,
+    revoke_refresh_token,
+    rotate_refresh_token
+)
 from datetime import timedelta
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+HASHER_BUSY = HTTPException(
+    status_code=503,
+    detail="Authentication is busy, please retry shortly",
+    headers={"Retry-After": "1"}
+)
+
+def _get_user(db: Session, username: str) -> User | None:
+    return db.query(User).filter(User.username == username).first()
+
+def _add_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+def _start_session(db: Session, user_id: int) -> str:
+    token = issue_refresh_token(db, user_id)
+    db.commit()
+    return token
 
 @router.post("/register", response_model=UserRead, tags=["Authentication"])
-def register_user(
+async def register_user(
     user: UserCreate,
     db: Session = Depends(get_db)
 ):
@@ -45,22 +69,24 @@ def register_user(
     }
     ```
     """
-    if db.query(User).filter(User.username == user.username).first():
+    if await run_db(db, _get_user, user.username):
         raise HTTPException(status_code=400, detail="Username already registered")
 
+    try:
+        hashed_password = await hash_password_async(user.password)
+    except PasswordHasherBusy:
+        raise HASHER_BUSY
+
     new_user = User(
         username=user.username,
         email=user.email,
         full_name=user.full_name,
-        hashed_password=hash_password(user.password)
+        hashed_password=hashed_password
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+    return await run_db(db, _add_user, new_user)
 
 @router.post("/login", response_model=Token, tags=["Authentication"])
-def login(
+async def login(
     user: UserCreate,
     db: Session = Depends(get_db)
 ):
@@ -68,7 +94,10 @@ def login(
     User login endpoint to authenticate and obtain a JWT token.
 
     - Users need to provide **username** and **password** to authenticate.
-    - On success, an **access_token** is returned.
+    - On success, an **access_token** and a **refresh_token** are returned. Renew the
+      access token through `/auth/refresh` instead of posting credentials again.
+    - Password checks run on a dedicated, size-limited bcrypt pool; when it is saturated
+      the endpoint answers **503** with `Retry-After` instead of queueing indefinitely.
 
     **Example Request**:
     ```
@@ -81,13 +110,75 @@ def login(
     ```
     {
       "access_token": "jwt_token_string",
-      "token_type": "bearer"
+      "token_type": "bearer",
+      "refresh_token": "opaque_refresh_token"
     }
     ```
     """
-    db_user = db.query(User).filter(User.username == user.username).first()
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+    db_user = await run_db(db, _get_user, user.username)
+    try:
+        valid = db_user is not None and await verify_password_async(user.password, db_user.hashed_password)
+    except PasswordHasherBusy:
+        raise HASHER_BUSY
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
     token = create_access_token(data={"sub": db_user.username})
-    return {"access_token": token, "token_type": "bearer"}
+    refresh_token = await run_db(db, _start_session, db_user.id)
+    return {"access_token": token, "token_type": "bearer", "refresh_token": refresh_token}
+
+@router.post("/refresh", response_model=Token, tags=["Authentication"])
+async def refresh(
+    request: RefreshRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+
+    - Refresh tokens rotate: the presented token is revoked and must be replaced by the
+      one returned here.
+    - Presenting a token that was already used revokes every token issued from the same
+      login and returns **401**; the user must log in again.
+    - No password check is involved, so renewals cost one indexed lookup rather than a bcrypt round.
+
+    **Example Request**:
+    ```
+    {
+      "refresh_token": "opaque_refresh_token"
+    }
+    ```
+    **Example Response**:
+    ```
+    {
+      "access_token": "jwt_token_string",
+      "token_type": "bearer",
+      "refresh_token": "new_opaque_refresh_token"
+    }
+    ```
+    """
+    try:
+        username, refresh_token = await run_db(db, rotate_refresh_token, request.refresh_token)
+    except RefreshTokenError as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
+
+    token = create_access_token(data={"sub": username})
+    return {"access_token": token, "token_type": "bearer", "refresh_token": refresh_token}
+
+@router.post("/logout", status_code=204, tags=["Authentication"])
+async def logout(
+    request: RefreshRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Revoke a refresh token and every token rotated from the same login.
+
+    Access tokens already issued stay valid until they expire.
+
+    **Example Request**:
+    ```
+    {
+      "refresh_token": "opaque_refresh_token"
+    }
+    ```
+    """
+    await run_db(db, revoke_refresh_token, request.refresh_token)
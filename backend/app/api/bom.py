@@ -1,22 +1,15 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
 from sqlalchemy.orm import Session
-from app.schemas.bom import BoMCreate, BoMRead
+from app.schemas.bom import BoMCreate, BoMRead, ProductComponentCreate, ProductComponentRead
 from app.crud import bom as crud_bom
-from app.models import bom as model_bom
-from app.db.database import SessionLocal, engine
+from app.db.database import get_db, get_read_db, run_db
+from app.models.material import Material
 from app.utils.bom import calculate_materials_for_batch
-
-model_bom.Base.metadata.create_all(bind=engine)
+from app.utils.bom_explosion import BoMCycleError, explode_product
+from app.utils.http_cache import cached_json_response, compute_etag, not_modified
 
 router = APIRouter(prefix="/bom", tags=["Bill of Materials"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=BoMRead, tags=["Bill of Materials"])
 def create_bom_entry(
     bom: BoMCreate, 
@@ -55,6 +48,7 @@ def create_bom_entry(
 
 @router.get("/", response_model=list[BoMRead], tags=["Bill of Materials"])
 def list_bom_entries(
+    request: Request,
     product_id: int | None = Query(default=None),
     db: Session = Depends(get_db)
 ):
@@ -63,6 +57,8 @@ def list_bom_entries(
 
     - **product_id** is optional, if provided, will filter BoM entries by product.
     - Returns a list of BoM entries associated with products.
+    - Responses carry an **ETag**; send it back in `If-None-Match` to get **304 Not Modified**
+      while no BoM line, product, material or location has changed.
 
     **Example Request**:
     ```json
@@ -92,14 +88,17 @@ def list_bom_entries(
     ]
     ```
     """
-    return crud_bom.get_boms(db, product_id=product_id)
+    etag = compute_etag(db, request, "bill_of_materials", "products", "materials", "locations")
+    return not_modified(request, etag) or cached_json_response(
+        etag, BoMRead, lambda: crud_bom.get_boms(db, product_id=product_id)
+    )
 
 @router.get("/calculate/", tags=["Bill of Materials"])
-def calculate_materials(
+async def calculate_materials(
     product_id: int,
     batch_size: int = 1,
     check_availability: bool = False,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Calculate the materials required for a specific batch size.
@@ -128,4 +127,91 @@ def calculate_materials(
     }
     ```
     """
-    return calculate_materials_for_batch(db, product_id, batch_size, check_availability)
+    return await run_db(db, calculate_materials_for_batch, product_id, batch_size, check_availability)
+
+@router.post("/components/", response_model=ProductComponentRead, tags=["Bill of Materials"])
+def create_component_entry(
+    component: ProductComponentCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Add a sub-assembly to a product's Bill of Materials.
+
+    - **product_id** is the assembled product, **component_id** the product it consumes.
+    - **quantity** is the number of component units used per unit of the product.
+    - Edges that would make a product contain itself are rejected with **400**.
+
+    **Example Request**:
+    ```json
+    {
+        "product_id": 1,
+        "component_id": 4,
+        "quantity": 2
+    }
+    ```
+
+    **Error Response** (Cycle):
+    ```json
+    {
+        "detail": "BoM cycle detected: product 4 -> product 1 -> product 4"
+    }
+    ```
+    """
+    try:
+        return crud_bom.create_component(db, component)
+    except BoMCycleError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/components/", response_model=list[ProductComponentRead], tags=["Bill of Materials"])
+def list_component_entries(
+    product_id: int | None = Query(default=None),
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieve sub-assembly edges, optionally filtered by the assembled **product_id**.
+    """
+    return crud_bom.get_components(db, product_id=product_id)
+
+def _explode(db: Session, product_id: int, batch_size: int) -> dict:
+    required = explode_product(db, product_id, batch_size)
+    materials = db.query(Material.id, Material.name, Material.unit).filter(Material.id.in_(required)).all()
+    return {
+        "product_id": product_id,
+        "batch_size": batch_size,
+        "materials": [
+            {"material_id": m.id, "name": m.name, "unit": m.unit, "required": required[m.id]}
+            for m in sorted(materials, key=lambda m: m.id)
+        ]
+    }
+
+@router.get("/explode/", tags=["Bill of Materials"])
+async def explode_materials(
+    product_id: int,
+    batch_size: int = 1,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Flatten a multi-level Bill of Materials into the total raw materials for a batch.
+
+    - Sub-assemblies (products used inside other products) are exploded recursively.
+    - Each sub-assembly's flattened requirement is memoized in-process until the next
+      BoM write, so repeat explosions are a cached lookup scaled by **batch_size**.
+
+    **Example Response**:
+    ```json
+    {
+        "product_id": 1,
+        "batch_size": 10,
+        "materials": [
+            {"material_id": 1, "name": "Fabric", "unit": "yards", "required": 25.0},
+            {"material_id": 2, "name": "Thread", "unit": "spools", "required": 4.0}
+        ]
+    }
+    ```
+
+    - A cyclic BoM returns **422 Unprocessable Entity**.
+    """
+    try:
+        return await run_db(db, _explode, product_id, batch_size)
+    except BoMCycleError as e:
+        raise HTTPException(status_code=422, detail=str(e))
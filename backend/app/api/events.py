@@ -0,0 +1,94 @@
+import asyncio
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.models.user import User
+from app.dependencies.roles import require_roles
+from app.services.change_events import change_events, format_sse
+
+router = APIRouter(prefix="/events", tags=["Live Updates"])
+
+
+def _control_event(name: str, token: str) -> str:
+    return f"id: {token}\nevent: {name}\ndata: {{}}\n\n"
+
+
+async def event_stream(request: Request, resume_token: str | None):
+    """
+    Yield SSE frames: replayed events after `resume_token`, then live ones.
+
+    The queue is subscribed before the replay is read, so nothing committed in
+    between is lost; events seen in both are sent once. A `reset` frame tells the
+    client to reload over REST, either because its token cannot be resumed or
+    because it fell too far behind.
+    """
+    queue = change_events.subscribe()
+    try:
+        last_seq, backlog = change_events.replay(resume_token)
+        if backlog is None:
+            yield _control_event("reset", change_events.token(last_seq))
+        elif not backlog:
+            # Hand out a resume token right away, even before the first change
+            yield _control_event("ready", change_events.token(last_seq))
+        for item in backlog or []:
+            yield format_sse(item)
+
+        while not await request.is_disconnected():
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=settings.EVENT_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if queue.overflowed:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.overflowed = False
+                last_seq = change_events.position()
+                yield _control_event("reset", change_events.token(last_seq))
+                continue
+            if item[0] <= last_seq:
+                continue
+            last_seq = item[0]
+            yield format_sse(item)
+    finally:
+        change_events.unsubscribe(queue)
+
+
+@router.get("/stream", tags=["Live Updates"])
+async def stream_changes(
+    request: Request,
+    last_event_id: str | None = None,
+    last_event_id_header: str | None = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(require_roles("admin", "operator"))
+):
+    """
+    Server-sent event stream of committed stock and production order changes.
+
+    - **admin** and **operator** roles can access this endpoint.
+    - `material` events come from every restock and deduction path; `production_order`
+      events from order creation, status updates and deductions.
+    - Every event carries an `id`: its resume token. On reconnect, send it back as the
+      **Last-Event-ID** header (browsers do this automatically) or the **last_event_id**
+      query parameter to receive only what was missed.
+    - A `reset` event means the token could not be resumed (server restart or too old):
+      reload `/materials/` and `/production_orders/`, then keep reading the stream.
+    - A `ready` event carries the starting token for a fresh connection.
+    - Comment lines (`: keep-alive`) are sent while idle to keep proxies from timing out.
+
+    **Example Response**:
+    ```
+    id: 3f9a1c2e-41
+    event: material
+    data: {"type": "material", "id": 3, "quantity": 42.5, "is_low_stock": false}
+
+    id: 3f9a1c2e-42
+    event: production_order
+    data: {"type": "production_order", "id": 7, "status": "complete", "completed_at": "2025-04-05T14:00:00"}
+    ```
+    """
+    return StreamingResponse(
+        event_stream(request, last_event_id or last_event_id_header),
+        media_type="text/event-stream",
+        # Disable proxy buffering (NGINX) so events are delivered as they happen
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
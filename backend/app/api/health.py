@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from app.db.database import get_db, get_pool_status
+from app.services.auth_utils import password_hasher
+from app.services.change_events import change_events
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+@router.get("/db", tags=["Health"])
+def database_health(db: Session = Depends(get_db)):
+    """
+    Check database connectivity and report live connection pool statistics.
+
+    - **checked_out** / **checked_in**: connections currently in use / idle in the pool.
+    - **overflow**: connections opened beyond the pool size (negative while below it).
+    - **avg_wait_ms** / **max_wait_ms**: time spent waiting to acquire a connection.
+    - **timeouts**: checkouts that gave up after the pool timeout.
+
+    **Example Response**:
+    ```json
+    {
+        "status": "ok",
+        "pool": {
+            "pool_class": "InstrumentedQueuePool",
+            "size": 10,
+            "checked_in": 9,
+            "checked_out": 1,
+            "overflow": -9,
+            "checkouts": 1520,
+            "timeouts": 0,
+            "avg_wait_ms": 0.042,
+            "max_wait_ms": 3.1
+        }
+    }
+    ```
+    """
+    try:
+        db.execute(text("SELECT 1"))
+    except SQLAlchemyError:
+        raise HTTPException(status_code=503, detail={"status": "unavailable", "pool": get_pool_status()})
+    return {"status": "ok", "pool": get_pool_status()}
+
+@router.get("/auth", tags=["Health"])
+def password_hashing_health():
+    """
+    Report the bcrypt executor's load and timings.
+
+    - **in_flight**: hashes running or queued; **rejected**: requests answered with 503.
+    - **avg_wait_ms**: time spent queued; **avg_time_ms**: bcrypt time at the current
+      **bcrypt_rounds**. Use these to tune `BCRYPT_ROUNDS` and `BCRYPT_WORKERS`.
+
+    **Example Response**:
+    ```json
+    {
+        "workers": 2,
+        "max_queue": 32,
+        "bcrypt_rounds": 12,
+        "in_flight": 0,
+        "rejected": 0,
+        "operations": {
+            "verify": {"count": 310, "avg_wait_ms": 12.4, "max_wait_ms": 180.2, "avg_time_ms": 245.1, "max_time_ms": 262.7}
+        }
+    }
+    ```
+    """
+    return password_hasher.snapshot()
+
+
+@router.get("/events", tags=["Health"])
+def change_stream_health():
+    """
+    Report the live change stream: connected clients and the replay buffer.
+
+    - **subscribers**: open `/events/stream` connections in this worker.
+    - **last_token**: resume token of the newest event; **retained**: events a
+      reconnecting client can still replay (`EVENT_BUFFER_SIZE`).
+
+    **Example Response**:
+    ```json
+    {
+        "subscribers": 3,
+        "last_token": "3f9a1c2e-42",
+        "retained": 42
+    }
+    ```
+    """
+    return change_events.snapshot()
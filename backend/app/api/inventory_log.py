@@ -1,32 +1,71 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+import csv
+import io
+import json
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
-from app.models.inventory_log import InventoryChangeLog
-from app.schemas.inventory_log import InventoryLogRead
+from app.db.database import SessionLocal, get_db, get_read_db, run_db
+from app.dependencies.roles import require_roles
+from app.models.inventory_log import InventoryChangeLog, ChangeType
+from app.models.user import User
+from app.schemas.inventory_log import InventoryDailyRead, InventoryLogRead
+from app.services.inventory_history import daily_history, rollup_inventory_logs
+from app.utils.pagination import encode_cursor, decode_cursor
 from typing import Optional, Literal
 
 router = APIRouter(prefix="/logs", tags=["Inventory Logs"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def _query_inventory_logs(
+    db: Session,
+    material_id: Optional[int],
+    type: Optional[str],
+    limit: int,
+    after: Optional[tuple] = None
+):
+    query = db.query(InventoryChangeLog)
+
+    if material_id is not None:
+        query = query.filter(InventoryChangeLog.material_id == material_id)
+
+    if type is not None:
+        query = query.filter(InventoryChangeLog.change_type == ChangeType(type))
+
+    # Keyset: resume strictly after the last (timestamp, id) of the previous page
+    if after is not None:
+        query = query.filter(tuple_(InventoryChangeLog.timestamp, InventoryChangeLog.id) < after)
+
+    # One extra row tells us whether another page exists
+    logs = query.order_by(
+        InventoryChangeLog.timestamp.desc(),
+        InventoryChangeLog.id.desc()
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(logs) > limit:
+        logs = logs[:limit]
+        next_cursor = encode_cursor(logs[-1].timestamp, logs[-1].id)
+    return logs, next_cursor
 
 @router.get("/inventory/", response_model=list[InventoryLogRead], tags=["Inventory Logs"])
-def get_inventory_logs(
-    db: Session = Depends(get_db),
+async def get_inventory_logs(
+    response: Response,
+    db: Session = Depends(get_read_db),
     material_id: Optional[int] = None,
     type: Optional[Literal["restock", "deduction"]] = None,
-    limit: int = Query(100, le=500)
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None
 ):
     """
     Retrieve inventory change logs.
 
     - You can filter logs by **material_id** to get logs for a specific material.
     - You can filter by **type** to retrieve either **restock** or **deduction** logs.
-    - The **limit** parameter controls how many logs are returned, with a default of 100 (max 500).
+    - The **limit** parameter controls how many logs are returned per page, with a default of 100 (max 500).
+    - Logs are ordered newest first. When more logs exist, the response carries an
+      **X-Next-Cursor** header; pass its value as **cursor** to fetch the next page.
+      Each page costs the same regardless of how deep into the ledger it is.
 
     **Example Request**:
     ```json
@@ -67,15 +106,168 @@ def get_inventory_logs(
         "detail": "Invalid type. Expected 'restock' or 'deduction'."
     }
     ```
+
+    - **Error Response** (Invalid Cursor):
+    ```json
+    {
+        "detail": "Invalid cursor"
+    }
+    ```
     """
-    query = db.query(InventoryChangeLog)
+    if type is not None and type not in ["restock", "deduction"]:
+        raise HTTPException(status_code=400, detail="Invalid type. Expected 'restock' or 'deduction'.")
 
-    if material_id is not None:
-        query = query.filter(InventoryChangeLog.material_id == material_id)
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
 
+    logs, next_cursor = await run_db(db, _query_inventory_logs, material_id, type, limit, after)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return logs
+
+
+EXPORT_COLUMNS = ["id", "material_id", "production_order_id", "change_type", "quantity", "remaining", "note", "timestamp"]
+EXPORT_CHUNK_ROWS = 1000
+
+def _export_record(row) -> dict:
+    record = dict(row._mapping)
+    record["change_type"] = record["change_type"].value
+    record["timestamp"] = record["timestamp"].isoformat()
+    return record
+
+def _stream_inventory_logs(
+    fmt: str,
+    material_id: Optional[int],
+    type: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime]
+):
+    stmt = select(*(getattr(InventoryChangeLog, name) for name in EXPORT_COLUMNS))
+    if material_id is not None:
+        stmt = stmt.where(InventoryChangeLog.material_id == material_id)
     if type is not None:
-        if type not in ["restock", "deduction"]:
-            raise HTTPException(status_code=400, detail="Invalid type. Expected 'restock' or 'deduction'.")
-        query = query.filter(InventoryChangeLog.change_type == type)
+        stmt = stmt.where(InventoryChangeLog.change_type == ChangeType(type))
+    if since is not None:
+        stmt = stmt.where(InventoryChangeLog.timestamp >= since)
+    if until is not None:
+        stmt = stmt.where(InventoryChangeLog.timestamp < until)
+    stmt = stmt.order_by(InventoryChangeLog.timestamp, InventoryChangeLog.id)
+
+    # The generator owns its session: it must stay open until the last chunk is sent
+    with SessionLocal() as db:
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_CHUNK_ROWS))
+
+        if fmt == "csv":
+            yield ",".join(EXPORT_COLUMNS) + "\r\n"
+
+        for rows in result.partitions():
+            records = [_export_record(row) for row in rows]
+            if fmt == "csv":
+                buffer = io.StringIO()
+                csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS).writerows(records)
+                yield buffer.getvalue()
+            else:
+                yield "".join(json.dumps(record) + "\n" for record in records)
 
-    return query.order_by(InventoryChangeLog.timestamp.desc()).limit(limit).all()
+@router.get("/inventory/export", tags=["Inventory Logs"])
+def export_inventory_logs(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    material_id: Optional[int] = None,
+    type: Optional[Literal["restock", "deduction"]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+):
+    """
+    Stream the full inventory ledger for accounting exports.
+
+    - **format**: `ndjson` (one JSON object per line, default) or `csv`.
+    - **material_id** / **type**: same filters as `/logs/inventory/`.
+    - **since** / **until**: optional time range (`since` inclusive, `until` exclusive).
+    - Rows are read through a server-side cursor and sent in chunks of 1000,
+      oldest first, so memory stays flat whatever the size of the ledger.
+
+    **Example Request**:
+    ```
+    GET /logs/inventory/export?format=csv&material_id=1&since=2025-04-01T00:00:00
+    ```
+
+    **Example Response** (`format=ndjson`):
+    ```
+    {"id": 1, "material_id": 1, "production_order_id": null, "change_type": "restock", "quantity": 20.0, "remaining": 70.0, "note": "Restocked 20 units", "timestamp": "2025-04-06T12:00:00"}
+    {"id": 2, "material_id": 1, "production_order_id": 3, "change_type": "deduction", "quantity": 10.0, "remaining": 60.0, "note": "Deduction for production order #3", "timestamp": "2025-04-07T09:30:00"}
+    ```
+    """
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_inventory_logs(format, material_id, type, since, until),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="inventory_logs.{format}"'}
+    )
+
+
+@router.get("/inventory/daily", response_model=list[InventoryDailyRead], tags=["Inventory Logs"])
+async def get_daily_inventory_history(
+    material_id: Optional[int] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Per-material daily totals: quantity restocked, quantity deducted and closing balance.
+
+    - Covers the whole history, including months already dropped from the ledger:
+      the daily aggregates are updated with every ledger write.
+    - **material_id**: limit to one material.
+    - **since** / **until**: optional day range (`since` inclusive, `until` exclusive).
+    - Days are ordered oldest first; days without any change are omitted.
+
+    **Example Request**:
+    ```
+    GET /logs/inventory/daily?material_id=1&since=2024-01-01
+    ```
+
+    **Example Response**:
+    ```json
+    [
+        {
+            "material_id": 1,
+            "day": "2024-01-03",
+            "restocked": 50.0,
+            "deducted": 12.5,
+            "closing_balance": 87.5,
+            "entries": 4
+        }
+    ]
+    ```
+    """
+    return await run_db(db, daily_history, material_id, since, until)
+
+@router.post("/inventory/rollup", tags=["Inventory Logs"])
+def rollup_inventory_history(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles("admin"))
+):
+    """
+    Drop ledger months older than the retention period.
+
+    - Only **admin** can run the rollup. It is normally run periodically (e.g. nightly)
+      with `python -m app.services.inventory_history`, which also creates upcoming
+      monthly ledger partitions on PostgreSQL.
+    - The cutoff is the start of the month `INVENTORY_LOG_RETENTION_DAYS` ago; older
+      partitions are dropped. Their history stays available from `/logs/inventory/daily`.
+      Running it again for the same cutoff changes nothing.
+
+    **Example Response**:
+    ```json
+    {
+        "cutoff": "2025-01-01T00:00:00",
+        "dropped_partitions": ["inventory_logs_y2024m12"],
+        "deleted_rows": 0
+    }
+    ```
+    """
+    return rollup_inventory_logs(db)
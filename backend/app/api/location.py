@@ -1,21 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from app.schemas.location import LocationCreate, LocationRead
 from app.crud import location as crud_location
-from app.models import location as model_location
-from app.db.database import SessionLocal, engine
-
-model_location.Base.metadata.create_all(bind=engine)
+from app.db.database import get_db
+from app.utils.http_cache import cached_json_response, compute_etag, not_modified
 
 router = APIRouter(prefix="/locations", tags=["Locations"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=LocationRead, tags=["Locations"])
 def create_location(
     location: LocationCreate, 
@@ -47,6 +38,7 @@ def create_location(
 
 @router.get("/", response_model=list[LocationRead], tags=["Locations"])
 def read_locations(
+    request: Request,
     skip: int = 0, 
     limit: int = 100, 
     db: Session = Depends(get_db)
@@ -56,6 +48,8 @@ def read_locations(
 
     - **skip**: Number of records to skip (used for pagination).
     - **limit**: The maximum number of records to return. Default is 100.
+    - Responses carry an **ETag**; send it back in `If-None-Match` to get **304 Not Modified**
+      while no location has changed.
 
     **Example Request**:
     ```json
@@ -82,4 +76,7 @@ def read_locations(
     ```
 
     """
-    return crud_location.get_locations(db, skip=skip, limit=limit)
+    etag = compute_etag(db, request, "locations")
+    return not_modified(request, etag) or cached_json_response(
+        etag, LocationRead, lambda: crud_location.get_locations(db, skip=skip, limit=limit)
+    )
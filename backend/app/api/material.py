@@ -1,24 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from app.schemas.material import MaterialCreate, MaterialRead
 from app.crud import material as crud_material
-from app.models import material as model_material
-from app.db.database import SessionLocal, engine
+from app.db.database import get_db
 from app.models.user import User
 from app.dependencies.auth import get_current_user
 from app.dependencies.roles import require_roles
-
-model_material.Base.metadata.create_all(bind=engine)
+from app.services.stock_snapshots import stock_as_of, take_snapshot
+from app.utils.http_cache import cached_json_response, compute_etag, not_modified
 
 router = APIRouter(prefix="/materials", tags=["Materials", "Inventory Management"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=MaterialRead, tags=["Materials", "Inventory Management"])
 def create_material(
     material: MaterialCreate,
@@ -34,8 +27,10 @@ def create_material(
 
 @router.get("/", response_model=list[MaterialRead], tags=["Materials", "Inventory Management"])
 def read_materials(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    as_of: datetime | None = Query(None, description="Report each material's quantity at this point in time"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles("admin", "operator"))
 ):
@@ -43,5 +38,52 @@ def read_materials(
     Retrieve a list of materials.
 
     - **admin** and **operator** roles can access this endpoint.
+    - **as_of**: optional timestamp; `quantity` is then the stock held at that time,
+      answered from the nearest stock snapshot plus the ledger entries after it.
+    - Responses carry an **ETag**; send it back in `If-None-Match` to get **304 Not Modified**
+      while no material has been created, restocked or deducted.
+
+    **Example Request**:
+    ```
+    GET /materials/?as_of=2025-03-31T23:59:59
+    ```
+    """
+    etag = compute_etag(db, request, "materials")
+    return not_modified(request, etag) or cached_json_response(
+        etag, MaterialRead, lambda: _material_list(db, skip, limit, as_of)
+    )
+
+def _material_list(db: Session, skip: int, limit: int, as_of: datetime | None) -> list[MaterialRead]:
+    materials = crud_material.get_materials(db, skip=skip, limit=limit)
+    quantities = stock_as_of(db, as_of, [m.id for m in materials]) if as_of is not None else {}
+    return [
+        MaterialRead(
+            id=m.id, name=m.name, description=m.description,
+            quantity=quantities.get(m.id, m.quantity), unit=m.unit
+        )
+        for m in materials
+    ]
+
+@router.post("/snapshots/", tags=["Materials", "Inventory Management"])
+def create_stock_snapshot(
+    taken_at: datetime | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles("admin"))
+):
+    """
+    Record a stock snapshot of every material (default: now).
+
+    - Only **admin** can take snapshots. Run it periodically (e.g. nightly) so `as_of`
+      reads only replay a short stretch of the ledger.
+    - Taking a snapshot for a timestamp that already has one is a no-op.
+
+    **Example Response**:
+    ```json
+    {
+        "taken_at": "2025-03-31T23:59:59",
+        "materials": 412
+    }
+    ```
     """
-    return crud_material.get_materials(db, skip=skip, limit=limit)
+    taken_at = taken_at or datetime.utcnow()
+    return {"taken_at": taken_at, "materials": take_snapshot(db, taken_at)}
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.db.database import get_read_db, run_db
+from app.models.user import User
+from app.dependencies.roles import require_roles
+from app.schemas.material import MaterialConsumptionRead
+from app.services.consumption import consumption_report
+
+router = APIRouter(prefix="/materials", tags=["Materials"])
+
+@router.get("/consumption/", response_model=list[MaterialConsumptionRead], tags=["Materials"])
+async def get_material_consumption(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_roles("admin", "operator"))
+):
+    """
+    Burn rate and days of cover of every material, for purchasing.
+
+    - **admin** and **operator** roles can access this endpoint.
+    - **deducted_1d** / **deducted_7d** / **deducted_30d**: quantity consumed over the
+      trailing 1, 7 and 30 days (UTC days, today included); **restocked_30d** likewise.
+    - **avg_daily_deduction**: `deducted_30d / 30`.
+    - **days_of_cover**: `quantity / avg_daily_deduction`; `null` when nothing was
+      deducted in the last 30 days.
+    - Answered from daily aggregates kept up to date by every restock and deduction,
+      never from a scan of the inventory ledger.
+
+    **Example Response**:
+    ```json
+    [
+        {
+            "material_id": 1,
+            "name": "Cotton Fabric",
+            "unit": "yards",
+            "quantity": 120.0,
+            "deducted_1d": 4.0,
+            "deducted_7d": 21.0,
+            "deducted_30d": 90.0,
+            "restocked_30d": 100.0,
+            "avg_daily_deduction": 3.0,
+            "days_of_cover": 40.0
+        }
+    ]
+    ```
+    """
+    return await run_db(db, consumption_report)
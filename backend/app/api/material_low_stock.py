@@ -1,24 +1,49 @@
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from app.db.database import get_read_db, run_db
 from app.models.material import Material
+from typing import Optional
 
 router = APIRouter(prefix="/materials", tags=["Materials"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def _query_low_stock(db: Session, changed_since: Optional[datetime]) -> list[dict]:
+    query = db.query(Material)
+    if changed_since is not None:
+        # Delta sync: every material that crossed the threshold (either way) since then
+        query = query.filter(Material.low_stock_changed_at >= changed_since)
+    else:
+        # Served from the partial index on is_low_stock, not a scan of all materials
+        query = query.filter(Material.is_low_stock.is_(True))
+
+    return [
+        {
+            "id": m.id,
+            "name": m.name,
+            "quantity": m.quantity,
+            "unit": m.unit,
+            "reorder_point": m.reorder_point,
+            "low_stock": m.is_low_stock,
+            "low_stock_changed_at": m.low_stock_changed_at
+        }
+        for m in query.order_by(Material.id).all()
+    ]
 
 @router.get("/low_stock/", tags=["Materials"])
-def get_low_stock_materials(db: Session = Depends(get_db)):
+async def get_low_stock_materials(
+    changed_since: Optional[datetime] = None,
+    db: Session = Depends(get_read_db)
+):
     """
     Retrieve materials that are below their reorder point (low stock).
 
     - Returns materials with a quantity lower than the defined reorder point.
-    
+    - The low-stock state is maintained on every restock and deduction, so this
+      reads only the flagged rows instead of comparing every material.
+    - **changed_since** (optional): return only materials whose low-stock state changed
+      at or after this time, including ones that recovered (`"low_stock": false`).
+      Clients polling for updates can pass the time of their previous poll.
+
     **Example Request**:
     No request body required for this endpoint.
 
@@ -30,26 +55,20 @@ def get_low_stock_materials(db: Session = Depends(get_db)):
             "name": "Material A",
             "quantity": 5,
             "unit": "kg",
-            "reorder_point": 10
+            "reorder_point": 10,
+            "low_stock": true,
+            "low_stock_changed_at": "2025-04-05T12:00:00"
         },
         {
             "id": 2,
             "name": "Material B",
             "quantity": 3,
             "unit": "m",
-            "reorder_point": 7
+            "reorder_point": 7,
+            "low_stock": true,
+            "low_stock_changed_at": "2025-04-06T08:30:00"
         }
     ]
     ```
     """
-    materials = db.query(Material).filter(Material.quantity < Material.reorder_point).all()
-    return [
-        {
-            "id": m.id,
-            "name": m.name,
-            "quantity": m.quantity,
-            "unit": m.unit,
-            "reorder_point": m.reorder_point
-        }
-        for m in materials
-    ]
+    return await run_db(db, _query_low_stock, changed_since)
@@ -1,19 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+import codecs
+import csv
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
-from app.models.material import Material
-from app.models.inventory_log import InventoryChangeLog, ChangeType
-from app.schemas.material_restock import MaterialRestockRequest
+from app.db.database import get_db, run_db
+from app.schemas.material_restock import MaterialRestockRequest, MaterialBulkRestockResponse
+from app.services.stock_movements import StockConflictError, restock_materials
 from sqlalchemy.exc import SQLAlchemyError
 
-router = APIRouter(prefix="/materials", tags=["Materials"])
+# Upper bound on lines accepted by one bulk restock request
+MAX_BULK_RESTOCK_LINES = 10000
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+router = APIRouter(prefix="/materials", tags=["Materials"])
 
 @router.post("/restock/", tags=["Materials"])
 def restock_material(
@@ -24,7 +23,8 @@ def restock_material(
     Restock a material in the inventory.
 
     - **material_id**: The ID of the material to be restocked.
-    - **quantity**: The amount of material to be added to inventory.
+    - **quantity**: The amount of material to be added to inventory. Must be a positive,
+      finite number: zero, negative, `NaN` and infinite quantities are rejected with **400**.
     - **note**: An optional note describing the restock.
 
     **Example Request**:
@@ -51,6 +51,13 @@ def restock_material(
     }
     ```
 
+    **Error Response** (Quantity not positive and finite):
+    ```json
+    {
+        "detail": "Quantity must be a positive, finite number"
+    }
+    ```
+
     **Error Response** (Database error):
     ```json
     {
@@ -60,26 +67,134 @@ def restock_material(
     """
     try:
         with db.begin():
-            material = db.query(Material).filter(Material.id == data.material_id).first()
-            if not material:
-                raise HTTPException(status_code=404, detail="Material not found")
-
-            material.quantity += data.quantity
-
-            db.add(InventoryChangeLog(
-                material_id=material.id,
-                change_type=ChangeType.RESTOCK,
-                quantity=data.quantity,
-                remaining=material.quantity,
-                note=data.note or "Manual restock"
-            ))
-
-            db.commit()
-            return {
-                "status": "success",
-                "message": f"Material '{material.name}' restocked by {data.quantity}. New total: {material.quantity}"
-            }
+            [result] = restock_materials(db, [data.dict()])
+            if result["status"] == "error":
+                status_code = 404 if result["detail"] == "Material not found" else 400
+                raise HTTPException(status_code=status_code, detail=result["detail"])
+
+        return {
+            "status": "success",
+            "message": f"Material '{result['material']}' restocked by {data.quantity}. New total: {result['remaining']}"
+        }
 
+    except StockConflictError:
+        raise HTTPException(status_code=409, detail="Stock changed concurrently, please retry")
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to restock material due to database error.")
+
+
+async def _read_csv_manifest(request: Request) -> list[tuple[int, dict]]:
+    # Decode the body chunk by chunk as it arrives; csv then handles quoting per line
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    text_lines, pending = [], ""
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        *complete, pending = pending.split("\n")
+        text_lines.extend(line + "\n" for line in complete)
+        if len(text_lines) > MAX_BULK_RESTOCK_LINES + 1:
+            raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_RESTOCK_LINES} lines per request")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        text_lines.append(pending)
+
+    reader = csv.DictReader(text_lines)
+    if not reader.fieldnames or not {"material_id", "quantity"} <= {name.strip() for name in reader.fieldnames}:
+        raise HTTPException(status_code=400, detail="CSV header must include material_id and quantity")
+    rows = []
+    for row in reader:
+        if any(value for value in row.values() if isinstance(value, str) and value.strip()):
+            rows.append((reader.line_num, {key.strip(): value for key, value in row.items() if key}))
+    return rows
+
+def _bulk_restock(db: Session, lines: list[dict]) -> list[dict]:
+    with db.begin():
+        return restock_materials(db, lines)
+
+@router.post("/restock/bulk", response_model=MaterialBulkRestockResponse, tags=["Materials"])
+async def bulk_restock_materials(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Restock many materials from one receiving manifest.
+
+    - Send either a JSON array of `{material_id, quantity, note}` objects
+      (`Content-Type: application/json`) or a CSV file with a `material_id,quantity,note`
+      header (`Content-Type: text/csv`); CSV bodies are read as a stream.
+    - All valid lines are applied in one transaction with a single set-based update and
+      one bulk ledger insert. Invalid lines (malformed values, unknown material IDs,
+      quantities that are not positive finite numbers) are reported in **errors** and
+      skipped; they do not reject the rest of the manifest.
+    - **line** is the 1-based position in the JSON array, or the line number in the CSV file.
+
+    **Example Request** (CSV):
+    ```
+    material_id,quantity,note
+    1,50,PO-1182
+    7,12.5,PO-1182
+    999,4,PO-1182
+    ```
+
+    **Example Response**:
+    ```json
+    {
+        "restocked": 2,
+        "failed": 1,
+        "errors": [
+            {"line": 4, "material_id": 999, "detail": "Material not found"}
+        ]
+    }
+    ```
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in ("text/csv", "application/csv"):
+        rows = await _read_csv_manifest(request)
+    elif content_type in ("application/json", ""):
+        try:
+            payload = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of restock lines")
+        if not isinstance(payload, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of restock lines")
+        rows = list(enumerate(payload, start=1))
+    else:
+        raise HTTPException(status_code=415, detail="Send application/json or text/csv")
+
+    if len(rows) > MAX_BULK_RESTOCK_LINES:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_RESTOCK_LINES} lines per request")
+
+    errors, lines, line_numbers = [], [], []
+    for line_number, row in rows:
+        try:
+            line = MaterialRestockRequest.parse_obj(row)
+        except ValidationError as e:
+            material_id = row.get("material_id") if isinstance(row, dict) else None
+            errors.append({
+                "line": line_number,
+                "material_id": material_id if isinstance(material_id, int) else None,
+                "detail": _validation_message(e)
+            })
+            continue
+        lines.append(line.dict())
+        line_numbers.append(line_number)
+
+    try:
+        results = await run_db(db, _bulk_restock, lines) if lines else []
+    except StockConflictError:
+        raise HTTPException(status_code=409, detail="Stock changed concurrently, please retry")
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Failed to restock materials due to database error.")
+
+    for line_number, result in zip(line_numbers, results):
+        if result["status"] == "error":
+            errors.append({"line": line_number, "material_id": result["material_id"], "detail": result["detail"]})
+    errors.sort(key=lambda error: error["line"])
+
+    restocked = sum(1 for result in results if result["status"] == "restocked")
+    return {"restocked": restocked, "failed": len(errors), "errors": errors}
+
+def _validation_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}" if location else first["msg"]
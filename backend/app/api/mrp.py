@@ -0,0 +1,92 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.db.database import get_read_db, run_db
+from app.models.user import User
+from app.dependencies.roles import require_roles
+from app.services.capacity import buildable_units
+from app.services.mrp import run_mrp
+from app.utils.bom_explosion import BoMCycleError
+
+router = APIRouter(prefix="/mrp", tags=["Material Requirements Planning"])
+
+@router.get("/", tags=["Material Requirements Planning"])
+async def material_requirements(
+    shortfall_only: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_roles("admin", "operator"))
+):
+    """
+    Total material demand of every **PLANNED** production order against current stock.
+
+    - **admin** and **operator** roles can access this endpoint.
+    - Multi-level BoMs are exploded down to raw materials.
+    - **shortfall_only**: only list materials whose demand exceeds stock.
+    - **affected_orders** lists the planned orders that need a short material.
+
+    **Example Response**:
+    ```json
+    {
+        "planned_orders": 2,
+        "affected_orders": [4, 7],
+        "materials": [
+            {
+                "material_id": 3,
+                "name": "Cotton Fabric",
+                "unit": "yards",
+                "demand": 120.0,
+                "on_hand": 80.0,
+                "shortfall": 40.0,
+                "affected_orders": [4, 7]
+            }
+        ]
+    }
+    ```
+
+    **Error Response** (component cycle):
+    ```json
+    {
+        "detail": "BoM cycle detected: product 1 -> product 2 -> product 1"
+    }
+    ```
+    """
+    try:
+        return await run_db(db, run_mrp, shortfall_only)
+    except BoMCycleError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@router.get("/capacity/", tags=["Material Requirements Planning"])
+async def buildable_capacity(
+    location_id: int | None = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_roles("admin", "operator"))
+):
+    """
+    How many units of each product can be built from current stock.
+
+    - **admin** and **operator** roles can access this endpoint.
+    - **location_id**: only products stored at this location.
+    - **limiting_material** is the material that runs out first; **buildable** is null
+      for products without a BoM.
+
+    **Example Response**:
+    ```json
+    [
+        {
+            "product_id": 1,
+            "name": "Tote Bag",
+            "location_id": 2,
+            "buildable": 12,
+            "limiting_material": {
+                "material_id": 3,
+                "name": "Cotton Fabric",
+                "available": 25.0,
+                "per_unit": 2.0
+            }
+        }
+    ]
+    ```
+    """
+    try:
+        return await run_db(db, buildable_units, location_id)
+    except BoMCycleError as e:
+        raise HTTPException(status_code=422, detail=str(e))
@@ -1,21 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from app.schemas.product import ProductCreate, ProductRead
 from app.crud import product as crud_product
-from app.models import product as model_product
-from app.db.database import SessionLocal, engine
-
-model_product.Base.metadata.create_all(bind=engine)
+from app.db.database import get_db
+from app.utils.http_cache import cached_json_response, compute_etag, not_modified
 
 router = APIRouter(prefix="/products", tags=["Products", "Inventory Management"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=ProductRead, tags=["Products", "Inventory Management"])
 def create_product(
     product: ProductCreate,
@@ -31,6 +22,7 @@ def create_product(
 
 @router.get("/", response_model=list[ProductRead], tags=["Products", "Inventory Management"])
 def read_products(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     location_id: int | None = Query(default=None),
@@ -41,8 +33,13 @@ def read_products(
 
     - **admin** and **operator** roles can view the products.
     - Allows for filtering products by location (if a location ID is provided).
+    - Responses carry an **ETag**; send it back in `If-None-Match` to get **304 Not Modified**
+      while no product or location has changed.
 
     - **Example**:
       - `GET /products?skip=0&limit=10&location_id=2`
     """
-    return crud_product.get_products(db, skip=skip, limit=limit, location_id=location_id)
+    etag = compute_etag(db, request, "products", "locations")
+    return not_modified(request, etag) or cached_json_response(
+        etag, ProductRead, lambda: crud_product.get_products(db, skip=skip, limit=limit, location_id=location_id)
+    )
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from app.db.database import get_db
 from app.models.production_audit_log import ProductionAuditLog
 from app.schemas.production_audit_log import ProductionAuditLogRead
 from app.models.user import User
@@ -10,13 +10,6 @@ from typing import List
 
 router = APIRouter(prefix="/production_orders", tags=["Production Orders", "Audit Logs"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/{order_id}/audit", response_model=List[ProductionAuditLogRead], tags=["Production Orders", "Audit Logs"])
 def get_audit_logs(
     order_id: int,
@@ -1,23 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from app.db.database import get_db, get_read_db, run_db
 from app.models.production_order import ProductionOrder, ProductionStatus
 from app.schemas.production_order import ProductionOrderCreate, ProductionOrderRead
 from app.models.user import User
 from app.dependencies.auth import get_current_user
 from app.dependencies.roles import require_roles
-from typing import List
+from app.services.change_events import order_events, queue_change_events
+from app.utils.pagination import encode_cursor, decode_cursor
+from typing import List, Optional
 from datetime import datetime
 
 router = APIRouter(prefix="/production_orders", tags=["Production Orders", "Order Management"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=ProductionOrderRead, tags=["Production Orders", "Order Management"])
 def create_order(
     data: ProductionOrderCreate,
@@ -59,20 +55,84 @@ def create_order(
         status=ProductionStatus.PLANNED
     )
     db.add(order)
+    db.flush()
+    queue_change_events(db, order_events([order.id], order.status))
     db.commit()
     db.refresh(order)
     return order
 
+def _query_orders(
+    db: Session,
+    statuses: Optional[list[ProductionStatus]],
+    product_id: Optional[int],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+    completed_from: Optional[datetime],
+    completed_to: Optional[datetime],
+    limit: int,
+    after: Optional[tuple] = None
+):
+    query = db.query(ProductionOrder)
+
+    if statuses:
+        query = query.filter(ProductionOrder.status.in_(statuses))
+    if product_id is not None:
+        query = query.filter(ProductionOrder.product_id == product_id)
+    if created_from is not None:
+        query = query.filter(ProductionOrder.created_at >= created_from)
+    if created_to is not None:
+        query = query.filter(ProductionOrder.created_at < created_to)
+    if completed_from is not None:
+        query = query.filter(ProductionOrder.completed_at >= completed_from)
+    if completed_to is not None:
+        query = query.filter(ProductionOrder.completed_at < completed_to)
+
+    # Keyset: resume strictly after the last (created_at, id) of the previous page
+    if after is not None:
+        query = query.filter(tuple_(ProductionOrder.created_at, ProductionOrder.id) < after)
+
+    # One extra row tells us whether another page exists
+    orders = query.order_by(
+        ProductionOrder.created_at.desc(),
+        ProductionOrder.id.desc()
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        next_cursor = encode_cursor(orders[-1].created_at, orders[-1].id)
+    return orders, next_cursor
+
 @router.get("/", response_model=List[ProductionOrderRead], tags=["Production Orders", "Order Management"])
-def list_orders(
-    db: Session = Depends(get_db),
+async def list_orders(
+    response: Response,
+    status: Optional[list[ProductionStatus]] = Query(None),
+    product_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    completed_from: Optional[datetime] = None,
+    completed_to: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_roles("admin", "operator"))
 ):
     """
-    Retrieve a list of all production orders.
-    
+    Retrieve production orders, newest first, one page at a time.
+
     - **admin** and **operator** roles can access this endpoint.
     - Orders are returned sorted by **created_at** in descending order.
+    - **status** may be repeated: `?status=planned&status=in_progress` is the open-orders view.
+    - Filter by **product_id**, and by **created_from**/**created_to** or
+      **completed_from**/**completed_to** (from inclusive, to exclusive).
+    - The **limit** parameter controls the page size, with a default of 100 (max 500).
+      When more orders exist, the response carries an **X-Next-Cursor** header; pass its
+      value as **cursor** to fetch the next page.
+
+    **Example Request**:
+    ```
+    GET /production_orders/?status=planned&status=in_progress&limit=50
+    ```
 
     **Example Response**:
     ```json
@@ -98,7 +158,20 @@ def list_orders(
     ]
     ```
     """
-    return db.query(ProductionOrder).order_by(ProductionOrder.created_at.desc()).all()
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    orders, next_cursor = await run_db(
+        db, _query_orders, status, product_id, created_from, created_to,
+        completed_from, completed_to, limit, after
+    )
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return orders
 
 @router.get("/{order_id}", response_model=ProductionOrderRead, tags=["Production Orders", "Order Management"])
 def get_order(
@@ -194,6 +267,7 @@ def update_status(
     order.status = status
     if status == ProductionStatus.COMPLETE:
         order.completed_at = datetime.utcnow()
+    queue_change_events(db, order_events([order.id], status, order.completed_at))
     db.commit()
     db.refresh(order)
     return order
@@ -1,22 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
-from app.models.production_order import ProductionOrder
-from app.schemas.production_order import ProductionOrderRead
-from app.services.production_deduction import deduct_for_production_order
+from app.db.database import get_db
+from app.models.production_order import ProductionOrder, ProductionStatus
+from app.schemas.production_order import (
+    ProductionOrderRead,
+    ProductionOrderBatchDeductRequest,
+    ProductionOrderBatchDeductResponse
+)
+from app.services.production_deduction import deduct_for_production_order, deduct_for_production_orders
+from app.services.stock_movements import StockConflictError
+from sqlalchemy.exc import SQLAlchemyError
 from app.models.user import User
 from app.dependencies.auth import get_current_user
 from app.dependencies.roles import require_roles
 
 router = APIRouter(prefix="/production_orders", tags=["Production Orders", "Material Deduction"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/{order_id}/deduct/", response_model=ProductionOrderRead, tags=["Production Orders", "Material Deduction"])
 def deduct_materials_for_order(
     order_id: int,
@@ -49,10 +48,70 @@ def deduct_materials_for_order(
     }
     ```
     """
-    order = db.query(ProductionOrder).filter(ProductionOrder.id == order_id).first()
+    # Lock the order so two concurrent requests cannot both deduct it
+    order = db.query(ProductionOrder).filter(ProductionOrder.id == order_id).with_for_update().first()
     if not order:
         raise HTTPException(status_code=404, detail="Production order not found")
+    if order.status == ProductionStatus.COMPLETE:
+        raise HTTPException(status_code=400, detail="Production order already complete")
 
-    deduct_for_production_order(order, db)
+    try:
+        deduct_for_production_order(order, db)
+    except StockConflictError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Stock changed concurrently, please retry")
     db.refresh(order)
     return order
+
+@router.post("/deduct/batch", response_model=ProductionOrderBatchDeductResponse, tags=["Production Orders", "Material Deduction"])
+def deduct_materials_for_orders(
+    data: ProductionOrderBatchDeductRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles("admin", "operator"))
+):
+    """
+    Deduct materials for many production orders in a single transaction.
+
+    - **admin** and **operator** roles can deduct materials for orders.
+    - Orders are fulfilled in the order given; material needs are summed per material
+      and each material is locked once for the whole batch.
+    - Orders that cannot be fulfilled are reported per order and do not stop the others.
+    - Fulfilled orders are marked **complete**, as with the single-order deduction.
+
+    **Example Request**:
+    ```json
+    {
+        "order_ids": [1, 2, 3]
+    }
+    ```
+
+    **Example Response**:
+    ```json
+    {
+        "deducted": 2,
+        "failed": 1,
+        "results": [
+            {"order_id": 1, "status": "deducted"},
+            {"order_id": 2, "status": "deducted"},
+            {
+                "order_id": 3,
+                "status": "insufficient",
+                "insufficient": [
+                    {"material_id": 4, "material": "Thread", "required": 120.0, "available": 35.0}
+                ]
+            }
+        ]
+    }
+    ```
+    """
+    try:
+        results = deduct_for_production_orders(data.order_ids, db)
+    except StockConflictError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Inventory changed during deduction, please retry.")
+    except SQLAlchemyError:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to deduct inventory due to database error.")
+
+    deducted = sum(1 for result in results if result["status"] == "deducted")
+    return {"deducted": deducted, "failed": len(results) - deducted, "results": results}
@@ -1,21 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
-from app.models.user import User, UserCreate, UserRead
-from app.dependencies.auth import get_current_user
+from app.db.database import get_db, run_db
+from app.models.user import User
+from app.schemas.auth import UserCreate, UserRead, UserRoleUpdate
+from app.services.auth_utils import PasswordHasherBusy, hash_password_async
+from app.api.auth import HASHER_BUSY
+from app.dependencies.auth import get_current_user, invalidate_principal
 from app.dependencies.roles import require_roles
 
 router = APIRouter(prefix="/users", tags=["Users", "User Management"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def _username_taken(db: Session, username: str) -> bool:
+    return db.query(User).filter(User.username == username).first() is not None
+
+def _add_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
 
 @router.post("/", response_model=UserRead, tags=["Users", "User Management"])
-def create_user(
+async def create_user(
     user: UserCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_roles("admin"))
@@ -24,12 +29,24 @@ def create_user(
     Register a new user.
 
     - Only **admin** role can create new users.
+    - The password is hashed on the same size-limited bcrypt pool as `/auth/register`;
+      when it is saturated the endpoint answers **503** with `Retry-After`.
     """
-    db_user = User(username=user.username)
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    if await run_db(db, _username_taken, user.username):
+        raise HTTPException(status_code=400, detail="Username already registered")
+
+    try:
+        hashed_password = await hash_password_async(user.password)
+    except PasswordHasherBusy:
+        raise HASHER_BUSY
+
+    db_user = User(
+        username=user.username,
+        email=user.email,
+        full_name=user.full_name,
+        hashed_password=hashed_password
+    )
+    return await run_db(db, _add_user, db_user)
 
 @router.get("/", response_model=list[UserRead], tags=["Users", "User Management"])
 def list_users(
@@ -42,3 +59,61 @@ def list_users(
     - **admin** role can list users.
     """
     return db.query(User).all()
+
+@router.put("/{user_id}/role", response_model=UserRead, tags=["Users", "User Management"])
+def update_user_role(
+    user_id: int,
+    data: UserRoleUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles("admin"))
+):
+    """
+    Change a user's role.
+
+    - Only **admin** role can change roles.
+    - Takes effect on the user's next request: their cached principal is dropped.
+
+    **Example Request**:
+    ```json
+    {
+        "role": "operator"
+    }
+    ```
+    """
+    db_user = db.query(User).filter(User.id == user_id).first()
+    if not db_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    db_user.role = data.role
+    db.commit()
+    invalidate_principal(db_user.username)
+    db.refresh(db_user)
+    return db_user
+
+@router.delete("/{user_id}", tags=["Users", "User Management"])
+def delete_user(
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_roles("admin"))
+):
+    """
+    Delete a user.
+
+    - Only **admin** role can delete users.
+    - Existing tokens for the user stop working immediately.
+
+    **Example Response**:
+    ```json
+    {
+        "status": "success",
+        "message": "User 3 deleted"
+    }
+    ```
+    """
+    db_user = db.query(User).filter(User.id == user_id).first()
+    if not db_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    username = db_user.username
+    db.delete(db_user)
+    db.commit()
+    invalidate_principal(username)
+    return {"status": "success", "message": f"User {user_id} deleted"}
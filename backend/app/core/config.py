@@ -0,0 +1,66 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class Settings:
+    """
+    Application settings read from the environment (or a `.env` file).
+    """
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "postgresql://user:password@db:5432/inventory")
+
+    # Connection pool
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = _get_bool("DB_POOL_PRE_PING", True)
+
+    # Per-statement timeout in milliseconds (PostgreSQL only, 0 disables it)
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+    # Async mode: read-heavy endpoints use an AsyncSession (asyncpg) instead of the threadpool
+    DB_ASYNC_ENABLED: bool = _get_bool("DB_ASYNC_ENABLED", False)
+    ASYNC_DATABASE_URL: str = os.getenv(
+        "ASYNC_DATABASE_URL",
+        DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+    )
+
+    # Number of products whose BoM lines are kept in the in-process LRU cache
+    BOM_CACHE_SIZE: int = int(os.getenv("BOM_CACHE_SIZE", "1024"))
+
+    # Authenticated principals are cached per token subject for this many seconds (0 disables)
+    PRINCIPAL_CACHE_TTL_SECONDS: float = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+
+    # Password hashing: bcrypt cost and the dedicated executor that runs it
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    BCRYPT_WORKERS: int = int(os.getenv("BCRYPT_WORKERS", "2"))
+    BCRYPT_MAX_QUEUE: int = int(os.getenv("BCRYPT_MAX_QUEUE", "32"))
+
+    # Rotating refresh tokens: lifetime of each token issued by /auth/login and /auth/refresh
+    REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+
+    # Serialized GET responses of catalog endpoints kept per ETag (0 disables the cache)
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+
+    # Live change stream (/events/stream): events retained for resume, and per-client backlog
+    EVENT_BUFFER_SIZE: int = int(os.getenv("EVENT_BUFFER_SIZE", "1000"))
+    EVENT_QUEUE_SIZE: int = int(os.getenv("EVENT_QUEUE_SIZE", "1000"))
+    EVENT_HEARTBEAT_SECONDS: float = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+
+    # Inventory ledger: months older than this are dropped (daily aggregates keep their history)
+    INVENTORY_LOG_RETENTION_DAYS: int = int(os.getenv("INVENTORY_LOG_RETENTION_DAYS", "180"))
+    # Monthly ledger partitions (PostgreSQL) created ahead of time by the maintenance job
+    INVENTORY_LOG_PARTITIONS_AHEAD: int = int(os.getenv("INVENTORY_LOG_PARTITIONS_AHEAD", "3"))
+
+
+settings = Settings()
@@ -1,9 +1,18 @@
-from sqlalchemy.orm import Session
-from app.models.bom import BillOfMaterial
-from app.schemas.bom import BoMCreate
+from sqlalchemy.orm import Session, selectinload
+from app.models.bom import BillOfMaterial, ProductComponent
+from app.models.product import Product
+from app.schemas.bom import BoMCreate, ProductComponentCreate
+from app.services.table_versions import bump_table_versions
+from app.utils.bom import invalidate_bom_lines
+from app.utils.bom_explosion import BoMCycleError, get_bom_graph, invalidate_bom_graph
 
 def get_boms(db: Session, product_id: int | None = None):
-    query = db.query(BillOfMaterial)
+    # BoMRead nests product (with its location) and material: load them up front in
+    # three queries total, each distinct product/material fetched once via IN (...)
+    query = db.query(BillOfMaterial).options(
+        selectinload(BillOfMaterial.product).joinedload(Product.location),
+        selectinload(BillOfMaterial.material)
+    )
     if product_id is not None:
         query = query.filter(BillOfMaterial.product_id == product_id)
     return query.all()
@@ -11,6 +20,28 @@ def get_boms(db: Session, product_id: int | None = None):
 def create_bom(db: Session, bom: BoMCreate):
     db_bom = BillOfMaterial(**bom.dict())
     db.add(db_bom)
+    bump_table_versions(db, "bill_of_materials")
     db.commit()
+    invalidate_bom_lines(bom.product_id)
+    invalidate_bom_graph()
     db.refresh(db_bom)
     return db_bom
+
+def get_components(db: Session, product_id: int | None = None):
+    query = db.query(ProductComponent)
+    if product_id is not None:
+        query = query.filter(ProductComponent.product_id == product_id)
+    return query.all()
+
+def create_component(db: Session, component: ProductComponentCreate):
+    # Adding product -> component closes a loop if the product is already inside the component
+    path = get_bom_graph(db).find_path(component.component_id, component.product_id)
+    if path is not None:
+        raise BoMCycleError([component.product_id] + path)
+
+    db_component = ProductComponent(**component.dict())
+    db.add(db_component)
+    db.commit()
+    invalidate_bom_graph()
+    db.refresh(db_component)
+    return db_component
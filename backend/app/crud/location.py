@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.location import Location
 from app.schemas.location import LocationCreate
+from app.services.table_versions import bump_table_versions
 
 def get_locations(db: Session, skip: int = 0, limit: int = 100):
     return db.query(Location).offset(skip).limit(limit).all()
@@ -8,6 +9,7 @@ def get_locations(db: Session, skip: int = 0, limit: int = 100):
 def create_location(db: Session, location: LocationCreate):
     db_location = Location(**location.dict())
     db.add(db_location)
+    bump_table_versions(db, "locations")
     db.commit()
     db.refresh(db_location)
     return db_location
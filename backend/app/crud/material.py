@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.material import Material
 from app.schemas.material import MaterialCreate
+from app.services.table_versions import bump_table_versions
 
 def get_materials(db: Session, skip: int = 0, limit: int = 100):
     return db.query(Material).offset(skip).limit(limit).all()
@@ -8,6 +9,7 @@ def get_materials(db: Session, skip: int = 0, limit: int = 100):
 def create_material(db: Session, material: MaterialCreate):
     db_material = Material(**material.dict())
     db.add(db_material)
+    bump_table_versions(db, "materials")
     db.commit()
     db.refresh(db_material)
     return db_material
@@ -1,9 +1,11 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from app.models.product import Product
 from app.schemas.product import ProductCreate
+from app.services.table_versions import bump_table_versions
 
 def get_products(db: Session, skip: int = 0, limit: int = 100, location_id: int | None = None):
-    query = db.query(Product)
+    # ProductRead nests the location; join it instead of lazy-loading per row
+    query = db.query(Product).options(joinedload(Product.location))
     if location_id is not None:
         query = query.filter(Product.location_id == location_id)
     return query.offset(skip).limit(limit).all()
@@ -12,6 +14,7 @@ def get_products(db: Session, skip: int = 0, limit: int = 100, location_id: int
 def create_product(db: Session, product: ProductCreate):
     db_product = Product(**product.dict())
     db.add(db_product)
+    bump_table_versions(db, "products")
     db.commit()
     db.refresh(db_product)
     return db_product
@@ -1,10 +1,241 @@
+import threading
+import time
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from app.core.config import Settings, settings
 
-SQLALCHEMY_DATABASE_URL = "postgresql://user:password@db:5432/inventory"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+class PoolMetrics:
+    """
+    Thread-safe counters describing how long requests wait for a pooled connection.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records the time spent acquiring each connection.
+    """
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            pool_metrics.record(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record(time.perf_counter() - start)
+        return connection
+
+
+def create_db_engine(config: Settings = settings) -> Engine:
+    """
+    Build the application engine from settings.
+
+    Pool sizing, pre-ping, recycle and timeout settings only apply to server
+    databases; SQLite (used in tests) keeps SQLAlchemy's default pool.
+    """
+    url = make_url(config.DATABASE_URL)
+    if url.get_backend_name() == "sqlite":
+        return create_engine(url, connect_args={"check_same_thread": False})
+
+    connect_args = {}
+    if url.get_backend_name() == "postgresql" and config.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["options"] = f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"
+
+    return create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+def create_async_db_engine(config: Settings = settings) -> AsyncEngine:
+    """
+    Build the asyncpg engine used when `DB_ASYNC_ENABLED` is set.
+    """
+    url = make_url(config.ASYNC_DATABASE_URL)
+    connect_args = {}
+    if url.get_backend_name() == "postgresql" and config.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["server_settings"] = {"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)}
+
+    return create_async_engine(
+        url,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_db_engine() if settings.DB_ASYNC_ENABLED else None
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None else None
+)
+
 Base = declarative_base()
+
+
+def get_db(request: Request):
+    """
+    FastAPI dependency yielding one session per request.
+
+    The session is recorded on `request.state.db` so the auth layer can reuse it; if
+    the auth layer resolved first, it already opened this route's session there.
+    """
+    db = getattr(request.state, "db", None)
+    if not isinstance(db, Session):
+        db = SessionLocal()
+        request.state.db = db
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db(request: Request):
+    """
+    FastAPI dependency yielding one AsyncSession per request (also on `request.state.db`).
+    """
+    db = getattr(request.state, "db", None)
+    if not isinstance(db, AsyncSession):
+        db = AsyncSessionLocal()
+        request.state.db = db
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+def _session_dependency(dependant):
+    """
+    `get_db` or `get_async_db` if the dependant (or one of its own dependencies) uses it.
+    """
+    for sub in dependant.dependencies:
+        if sub.call in (get_db, get_async_db):
+            return sub.call
+        found = _session_dependency(sub)
+        if found is not None:
+            return found
+    return None
+
+
+def open_request_db(request: Request) -> tuple[Session | AsyncSession | None, bool]:
+    """
+    The session of the current route, opening it now if the route has not resolved it yet.
+
+    Returns `(session, opened)`. Whatever order a route declares its dependencies in,
+    the auth layer and the route share one session; `opened` tells the caller it
+    created the session and must close it should the route never get to run.
+    `(None, False)` for routes without a session (e.g. streaming responses).
+    """
+    db = getattr(request.state, "db", None)
+    if db is not None:
+        return db, False
+    dependant = getattr(request.scope.get("route"), "dependant", None)
+    dependency = _session_dependency(dependant) if dependant is not None else None
+    if dependency is None:
+        return None, False
+    db = AsyncSessionLocal() if dependency is get_async_db else SessionLocal()
+    request.state.db = db
+    return db, True
+
+
+async def run_short_lived_db(fn, *args, **kwargs):
+    """
+    Run `fn(session, *args, **kwargs)` on a session that is closed before returning.
+
+    For request code with no session of its own, e.g. streaming responses, which must
+    not hold a pooled connection for as long as the client stays connected.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            return await db.run_sync(fn, *args, **kwargs)
+
+    def run():
+        with SessionLocal() as db:
+            return fn(db, *args, **kwargs)
+    return await run_in_threadpool(run)
+
+
+# Read-heavy endpoints depend on `get_read_db`: the AsyncSession in async mode, `get_db` otherwise.
+get_read_db = get_async_db if settings.DB_ASYNC_ENABLED else get_db
+
+
+async def run_db(db: Session | AsyncSession, fn, *args, **kwargs):
+    """
+    Run sync query code `fn(session, *args, **kwargs)` against either session type.
+
+    An AsyncSession runs it on its greenlet bridge without occupying a worker thread;
+    a regular Session runs it in the threadpool so the event loop never blocks.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def _queue_pool_stats(pool) -> dict:
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    return stats
+
+
+def get_pool_status() -> dict:
+    """
+    Live statistics for the engine's connection pool.
+    """
+    status = _queue_pool_stats(engine.pool)
+    status.update(pool_metrics.snapshot())
+    if async_engine is not None:
+        status["async_pool"] = _queue_pool_stats(async_engine.pool)
+    return status
@@ -1,22 +1,47 @@
-from fastapi import Depends, HTTPException, status
+from typing import AsyncIterator
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from app.core.config import settings
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import open_request_db, run_db, run_short_lived_db
 from app.models.user import User
+from app.utils.cache import LRUCache
 
 from app.services.auth_utils import SECRET_KEY, ALGORITHM
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Resolved principals keyed by token subject. The short TTL bounds staleness across
+# workers; changes made through /users/ invalidate this worker's entry immediately.
+_principal_cache = LRUCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+def invalidate_principal(username: str | None = None) -> None:
+    if username is None:
+        _principal_cache.clear()
+    else:
+        _principal_cache.pop(username)
+
+def _get_user_by_username(db: Session, username: str) -> User | None:
+    user = db.query(User).filter(User.username == username).first()
+    if user is not None:
+        # Detach the fully loaded row so it can be shared by later requests
+        db.expunge(user)
+    return user
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+async def _close(db: Session | AsyncSession) -> None:
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        await run_in_threadpool(db.close)
+
+async def get_current_user(request: Request, token: str = Depends(oauth2_scheme)) -> AsyncIterator[User]:
+    # The lookup runs on the route's own session (sync or async), whatever the order of
+    # the route's dependencies, so an authenticated request checks out one connection.
+    # Routes without a session (e.g. /events/stream) get a short-lived one that is
+    # released before the response starts.
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -30,7 +55,24 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
-        raise credentials_exception
-    return user
+    opened = None
+    try:
+        user = _principal_cache.get(username)
+        if user is None:
+            db, created = open_request_db(request)
+            if created:
+                opened = db
+            if db is not None:
+                user = await run_db(db, _get_user_by_username, username)
+            else:
+                user = await run_short_lived_db(_get_user_by_username, username)
+            if user is None:
+                raise credentials_exception
+            if settings.PRINCIPAL_CACHE_TTL_SECONDS > 0:
+                _principal_cache.set(username, user)
+        yield user
+    finally:
+        # Opened here for a route that declares `db` after the user: closed once the
+        # route is done, or right away if the request is rejected before it runs
+        if opened is not None:
+            await _close(opened)
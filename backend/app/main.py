@@ -1,26 +1,49 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from app.api import inventory
 from app.api import product
 from app.api import material
 from app.api import location
+from app.api import bom
 from app.api import bom_deduct  # ✅ New import
 from app.api import material_restock
 from app.api import material_low_stock
+from app.api import material_consumption
 from app.api import inventory_log
 from app.api import production_order
 from app.api import production_order_deduct
 from app.api import production_audit_log
+from app.api import health
+from app.api import user_management
+from app.api import auth
+from app.api import mrp
+from app.api import events
+from app.services import inventory_history
 
-app = FastAPI(title="Craft Inventory System")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Ledger writes never create partitions themselves: make the coming months exist now
+    await run_in_threadpool(inventory_history.prepare_log_partitions)
+    yield
+
+app = FastAPI(title="Craft Inventory System", lifespan=lifespan)
 
 app.include_router(inventory.router)
 app.include_router(product.router)
 app.include_router(material.router)
 app.include_router(location.router)
+app.include_router(bom.router)
 app.include_router(bom_deduct.router)  # ✅ New route
 app.include_router(material_restock.router)
 app.include_router(material_low_stock.router)
+app.include_router(material_consumption.router)
 app.include_router(inventory_log.router)
 app.include_router(production_order.router)
 app.include_router(production_order_deduct.router)
-app.include_router(production_audit_log.router)
\ No newline at end of file
+app.include_router(production_audit_log.router)
+app.include_router(health.router)
+app.include_router(user_management.router)
+app.include_router(auth.router)
+app.include_router(mrp.router)
+app.include_router(events.router)
\ No newline at end of file
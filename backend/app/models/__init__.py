@@ -0,0 +1,16 @@
+# Import every model so `Base.metadata` is complete (migrations, tests) and string
+# relationship targets resolve no matter which module is imported first.
+from app.models import (  # noqa: F401
+    bom,
+    inventory_daily_aggregate,
+    inventory_log,
+    location,
+    material,
+    product,
+    production_audit_log,
+    production_order,
+    refresh_token,
+    stock_snapshot,
+    table_version,
+    user,
+)
@@ -16,3 +16,22 @@ class BillOfMaterial(Base):
     __table_args__ = (
         UniqueConstraint("product_id", "material_id", name="uix_product_material"),
     )
+
+
+class ProductComponent(Base):
+    """
+    Sub-assembly edge: one unit of `product_id` consumes `quantity` units of `component_id`.
+    """
+    __tablename__ = "product_components"
+
+    id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    component_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    quantity = Column(Float, nullable=False)
+
+    product = relationship("Product", foreign_keys=[product_id])
+    component = relationship("Product", foreign_keys=[component_id])
+
+    __table_args__ = (
+        UniqueConstraint("product_id", "component_id", name="uix_product_component"),
+    )
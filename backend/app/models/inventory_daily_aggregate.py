@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, Index, UniqueConstraint
+from app.db.database import Base
+
+class InventoryDailyAggregate(Base):
+    __tablename__ = "inventory_daily_aggregates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    material_id = Column(Integer, ForeignKey("materials.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False)
+    restocked = Column(Float, nullable=False, default=0.0)
+    deducted = Column(Float, nullable=False, default=0.0)
+    closing_balance = Column(Float, nullable=False)  # `remaining` of the day's last ledger row
+    entries = Column(Integer, nullable=False, default=0)  # Ledger rows folded into this day
+
+    __table_args__ = (
+        UniqueConstraint("material_id", "day", name="uix_inventory_daily_material_day"),
+        # Trailing-window reads across all materials (/materials/consumption/)
+        Index("ix_inventory_daily_aggregates_day_material", "day", "material_id"),
+    )
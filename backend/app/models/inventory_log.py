@@ -1,10 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum as PyEnum
 from app.db.database import Base
 
-class ChangeType(PyEnum):
+class ChangeType(str, PyEnum):
     RESTOCK = "restock"
     DEDUCTION = "deduction"
 
@@ -18,7 +18,16 @@ class InventoryChangeLog(Base):
     quantity = Column(Float, nullable=False)
     remaining = Column(Float, nullable=False)
     note = Column(String, nullable=True)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
 
     material = relationship("Material", back_populates="inventory_logs")
     production_order = relationship("ProductionOrder", backref="inventory_logs")
+
+    # On PostgreSQL the table is range-partitioned by month on `timestamp` (migration 0009),
+    # with primary key (id, timestamp); `id` alone stays unique through its sequence.
+    # Keyset indexes matching the (timestamp, id) ordering of /logs/inventory/
+    __table_args__ = (
+        Index("ix_inventory_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_inventory_logs_material_timestamp", "material_id", "timestamp", "id"),
+        Index("ix_inventory_logs_change_type_timestamp", "change_type", "timestamp", "id"),
+    )
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Index, event
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 from app.models.inventory_log import InventoryChangeLog  # New import
@@ -13,9 +14,41 @@ class Material(Base):
     unit = Column(String, default="yards")  # e.g., yards, meters, pieces
     reorder_point = Column(Float, default=0.0)  # minimum required quantity
 
+    # Maintained on every write: True while quantity < reorder_point
+    is_low_stock = Column(Boolean, nullable=False, default=False)
+    low_stock_changed_at = Column(DateTime, nullable=True, index=True)  # last threshold crossing
+
     # 🔁 Inventory change logs
     inventory_logs = relationship(
         "InventoryChangeLog",
         back_populates="material",
         cascade="all, delete"
     )
+
+    __table_args__ = (
+        # Partial index: /materials/low_stock/ only ever reads the low rows
+        Index(
+            "ix_materials_low_stock",
+            "id",
+            postgresql_where=is_low_stock.is_(True),
+            sqlite_where=is_low_stock.is_(True)
+        ),
+    )
+
+
+@event.listens_for(Material, "before_insert")
+@event.listens_for(Material, "before_update")
+def _sync_low_stock_flag(mapper, connection, target):
+    """
+    Keep `is_low_stock` in step with ORM writes (restock, manual edits).
+
+    `low_stock_changed_at` is stamped only when the flag flips, or on insert when the
+    material starts out low, so `changed_since` reads return real threshold crossings.
+    Set-based updates bypass this hook and compute the flag in SQL instead
+    (see `app.services.stock_movements.apply_stock_changes`).
+    """
+    is_low = (target.quantity or 0.0) < (target.reorder_point or 0.0)
+    was_low = bool(target.is_low_stock)
+    target.is_low_stock = is_low
+    if is_low != was_low:
+        target.low_stock_changed_at = datetime.utcnow()
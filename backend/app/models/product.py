@@ -13,3 +13,4 @@ class Product(Base):
     location_id = Column(Integer, ForeignKey("locations.id"))
 
     location = relationship("Location")
+    production_orders = relationship("ProductionOrder", back_populates="product")
@@ -1,10 +1,10 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum as PyEnum
 from app.db.database import Base
 
-class ProductionStatus(PyEnum):
+class ProductionStatus(str, PyEnum):
     PLANNED = "planned"
     IN_PROGRESS = "in_progress"
     COMPLETE = "complete"
@@ -21,3 +21,18 @@ class ProductionOrder(Base):
     completed_at = Column(DateTime, nullable=True)
 
     product = relationship("Product", back_populates="production_orders")
+
+    # Keyset indexes matching the (created_at, id) ordering of /production_orders/ and its filters
+    __table_args__ = (
+        Index("ix_production_orders_created_at_id", "created_at", "id"),
+        Index("ix_production_orders_status_created_at", "status", "created_at", "id"),
+        Index("ix_production_orders_product_created_at", "product_id", "created_at", "id"),
+        Index("ix_production_orders_completed_at", "completed_at"),
+        # Operators' open-orders view touches only planned and in-progress rows
+        Index(
+            "ix_production_orders_open",
+            "created_at", "id",
+            postgresql_where=text("status IN ('PLANNED', 'IN_PROGRESS')"),
+            sqlite_where=text("status IN ('PLANNED', 'IN_PROGRESS')")
+        ),
+    )
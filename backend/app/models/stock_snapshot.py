@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index, UniqueConstraint
+from app.db.database import Base
+
+class StockSnapshot(Base):
+    __tablename__ = "stock_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    material_id = Column(Integer, ForeignKey("materials.id", ondelete="CASCADE"), nullable=False)
+    taken_at = Column(DateTime, nullable=False)
+    quantity = Column(Float, nullable=False)
+    last_log_id = Column(Integer, nullable=False)  # Last inventory_logs.id of this material folded into `quantity`
+
+    __table_args__ = (
+        UniqueConstraint("material_id", "taken_at", name="uix_stock_snapshot_material_taken_at"),
+        Index("ix_stock_snapshots_taken_at_material", "taken_at", "material_id"),
+    )
@@ -0,0 +1,8 @@
+from sqlalchemy import Column, String, BigInteger
+from app.db.database import Base
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    name = Column(String, primary_key=True)  # Table name, e.g. "materials"
+    version = Column(BigInteger, nullable=False, default=0)  # Bumped by every write to that table
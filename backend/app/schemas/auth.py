@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import Literal
 
 class UserCreate(BaseModel):
     username: str
@@ -11,10 +12,18 @@ class UserRead(BaseModel):
     username: str
     email: str | None
     full_name: str | None
+    role: str | None = None
 
     class Config:
         orm_mode = True
 
+class UserRoleUpdate(BaseModel):
+    role: Literal["admin", "operator", "viewer"]
+
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
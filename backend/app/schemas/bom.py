@@ -17,3 +17,17 @@ class BoMRead(BoMBase):
 
     class Config:
         orm_mode = True
+
+class ProductComponentBase(BaseModel):
+    product_id: int
+    component_id: int
+    quantity: float
+
+class ProductComponentCreate(ProductComponentBase):
+    pass
+
+class ProductComponentRead(ProductComponentBase):
+    id: int
+
+    class Config:
+        orm_mode = True
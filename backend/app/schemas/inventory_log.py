@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import Literal
-from datetime import datetime
+from datetime import date, datetime
 
 class InventoryLogRead(BaseModel):
     id: int
@@ -13,3 +13,11 @@ class InventoryLogRead(BaseModel):
 
     class Config:
         orm_mode = True
+
+class InventoryDailyRead(BaseModel):
+    material_id: int
+    day: date
+    restocked: float
+    deducted: float
+    closing_balance: float
+    entries: int
@@ -14,3 +14,15 @@ class MaterialRead(MaterialBase):
 
     class Config:
         orm_mode = True
+
+class MaterialConsumptionRead(BaseModel):
+    material_id: int
+    name: str
+    unit: str | None
+    quantity: float
+    deducted_1d: float
+    deducted_7d: float
+    deducted_30d: float
+    restocked_30d: float
+    avg_daily_deduction: float
+    days_of_cover: float | None
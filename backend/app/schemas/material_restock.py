@@ -8,3 +8,13 @@ class MaterialRestockRequest(BaseModel):
 
     class Config:
         orm_mode = True
+
+class MaterialRestockLineError(BaseModel):
+    line: int  # 1-based position in the JSON array, or the line number in the CSV file
+    material_id: Optional[int] = None
+    detail: str
+
+class MaterialBulkRestockResponse(BaseModel):
+    restocked: int
+    failed: int
+    errors: list[MaterialRestockLineError]
@@ -18,3 +18,17 @@ class ProductionOrderRead(BaseModel):
 
     class Config:
         orm_mode = True
+
+class ProductionOrderBatchDeductRequest(BaseModel):
+    order_ids: list[int]
+
+class ProductionOrderDeductResult(BaseModel):
+    order_id: int
+    status: Literal["deducted", "insufficient", "not_found", "no_bom", "skipped"]
+    detail: Optional[str] = None
+    insufficient: Optional[list[dict]] = None
+
+class ProductionOrderBatchDeductResponse(BaseModel):
+    deducted: int
+    failed: int
+    results: list[ProductionOrderDeductResult]
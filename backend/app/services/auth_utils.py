@@ -1,13 +1,18 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt
+from app.core.config import settings
 
 # Config
 SECRET_KEY = "your_secret_key"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -20,3 +25,94 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Raised when the password hashing queue is full; callers should answer 503.
+    """
+
+
+class PasswordHashExecutor:
+    """
+    Dedicated, size-limited thread pool for bcrypt work.
+
+    Hashing runs on its own `workers` threads so a login burst cannot exhaust the
+    threadpool that serves every other endpoint. At most `max_queue` calls wait
+    behind the running ones; beyond that `run` fails fast with `PasswordHasherBusy`.
+    Queue wait and bcrypt time are recorded per operation for tuning `BCRYPT_ROUNDS`.
+    """
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._stats = {}
+
+    def _record(self, operation: str, waited: float, elapsed: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(operation, {
+                "count": 0, "total_wait": 0.0, "max_wait": 0.0, "total_time": 0.0, "max_time": 0.0
+            })
+            stats["count"] += 1
+            stats["total_wait"] += waited
+            stats["max_wait"] = max(stats["max_wait"], waited)
+            stats["total_time"] += elapsed
+            stats["max_time"] = max(stats["max_time"], elapsed)
+
+    def _timed(self, operation: str, submitted: float, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self._record(operation, started - submitted, time.perf_counter() - started)
+
+    async def run(self, operation: str, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordHasherBusy()
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, self._timed, operation, time.perf_counter(), fn, *args
+            )
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+                "in_flight": self._in_flight,
+                "rejected": self._rejected,
+                "operations": {
+                    operation: {
+                        "count": stats["count"],
+                        "avg_wait_ms": round(stats["total_wait"] / stats["count"] * 1000, 3),
+                        "max_wait_ms": round(stats["max_wait"] * 1000, 3),
+                        "avg_time_ms": round(stats["total_time"] / stats["count"] * 1000, 3),
+                        "max_time_ms": round(stats["max_time"] * 1000, 3),
+                    }
+                    for operation, stats in self._stats.items()
+                },
+            }
+
+
+password_hasher = PasswordHashExecutor(settings.BCRYPT_WORKERS, settings.BCRYPT_MAX_QUEUE)
+
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.run("hash", hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run("verify", verify_password, plain_password, hashed_password)
@@ -0,0 +1,64 @@
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.material import Material
+from app.models.product import Product
+from app.services.mrp import bom_matrix
+from app.utils.bom_explosion import get_bom_graph
+
+
+def buildable_units(db: Session, location_id: int | None = None) -> list[dict]:
+    """
+    How many units of each product current stock can build, and which material limits it.
+
+    For every product this is `min(material.quantity / per_unit)` over its flattened
+    (multi-level) BoM. All products are computed in one pass: the per-entry ratios
+    are a single array division, and the per-product minimum is found by sorting the
+    entries by (product, ratio) and taking the first entry of each product.
+    Products without a BoM report `buildable: null`.
+    """
+    stmt = select(Product.id, Product.name, Product.location_id).order_by(Product.id)
+    if location_id is not None:
+        stmt = stmt.where(Product.location_id == location_id)
+    products = db.execute(stmt).all()
+    materials = db.execute(select(Material.id, Material.name, Material.quantity).order_by(Material.id)).all()
+    if not products:
+        return []
+
+    material_index = {m.id: i for i, m in enumerate(materials)}
+    rows, cols, per_unit = bom_matrix(get_bom_graph(db), [p.id for p in products], material_index)
+    used = per_unit > 0
+    rows, cols, per_unit = rows[used], cols[used], per_unit[used]
+
+    on_hand = np.array([max(m.quantity or 0.0, 0.0) for m in materials], dtype=np.float64)
+    ratio = on_hand[cols] / per_unit
+
+    # First entry of each row after sorting by (row, ratio) is that product's bottleneck
+    ordering = np.lexsort((ratio, rows))
+    first = ordering[np.flatnonzero(np.diff(rows[ordering], prepend=-1))]
+    limiting = dict(zip(rows[first].tolist(), first.tolist()))
+
+    result = []
+    for row, product in enumerate(products):
+        entry = limiting.get(row)
+        if entry is None:
+            result.append({
+                "product_id": product.id, "name": product.name, "location_id": product.location_id,
+                "buildable": None, "limiting_material": None
+            })
+            continue
+        material = materials[cols[entry]]
+        result.append({
+            "product_id": product.id,
+            "name": product.name,
+            "location_id": product.location_id,
+            # Tolerate float noise so 10 / 0.1 still builds 100 units
+            "buildable": int(np.floor(ratio[entry] + 1e-9)),
+            "limiting_material": {
+                "material_id": material.id,
+                "name": material.name,
+                "available": float(on_hand[cols[entry]]),
+                "per_unit": round(float(per_unit[entry]), 4)
+            }
+        })
+    return result
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import secrets
+import threading
+from collections import deque
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+_PENDING_KEY = "pending_change_events"
+
+
+class ChangeEventBroker:
+    """
+    In-process fan-out of committed stock and order changes to live subscribers.
+
+    Every event gets a resume token `<epoch>-<seq>`: the epoch is random per process,
+    so tokens issued before a restart are recognised as stale. The last `buffer_size`
+    events are retained so a reconnecting client can replay what it missed.
+    Publishing is thread-safe; subscribers are asyncio queues on the event loop.
+    """
+    def __init__(self, buffer_size: int = 1000, queue_size: int = 1000):
+        self.epoch = secrets.token_hex(4)
+        self.queue_size = queue_size
+        self._seq = 0
+        self._buffer = deque(maxlen=buffer_size)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, events: list[dict]) -> None:
+        if not events:
+            return
+        with self._lock:
+            published = []
+            for payload in events:
+                self._seq += 1
+                item = (self._seq, f"{self.epoch}-{self._seq}", payload)
+                self._buffer.append(item)
+                published.append(item)
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, published)
+            except RuntimeError:
+                # The subscriber's event loop has already shut down
+                self.unsubscribe(queue)
+
+    def _deliver(self, queue: asyncio.Queue, items: list) -> None:
+        for item in items:
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                # A client too slow to keep up is told to reload instead of blocking publishers
+                queue.overflowed = True
+                return
+
+    def token(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def replay(self, token: str | None) -> tuple[int, list | None]:
+        """
+        `(position, events)`: the current sequence number and the retained events
+        after `token`, oldest first. `events` is `None` if the client must reload.
+        """
+        with self._lock:
+            if token is None:
+                return self._seq, []
+            epoch, _, seq = token.partition("-")
+            if epoch != self.epoch or not seq.isdigit() or int(seq) > self._seq:
+                return self._seq, None
+            seq = int(seq)
+            if seq < self._seq and (not self._buffer or self._buffer[0][0] > seq + 1):
+                return self._seq, None
+            return self._seq, [item for item in self._buffer if item[0] > seq]
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        queue.overflowed = False
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers = {sub for sub in self._subscribers if sub[1] is not queue}
+
+    def position(self) -> int:
+        with self._lock:
+            return self._seq
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "last_token": f"{self.epoch}-{self._seq}",
+                "retained": len(self._buffer),
+            }
+
+
+change_events = ChangeEventBroker(
+    buffer_size=settings.EVENT_BUFFER_SIZE,
+    queue_size=settings.EVENT_QUEUE_SIZE
+)
+
+
+def queue_change_events(db: Session, events: list[dict]) -> None:
+    """
+    Stage events on the session; they are published only if the transaction commits.
+    """
+    db.info.setdefault(_PENDING_KEY, []).extend(events)
+
+
+def material_events(rows) -> list[dict]:
+    return [
+        {"type": "material", "id": row.id, "quantity": row.quantity, "is_low_stock": row.is_low_stock}
+        for row in rows
+    ]
+
+
+def order_events(order_ids, status, completed_at: datetime | None = None) -> list[dict]:
+    return [
+        {
+            "type": "production_order",
+            "id": order_id,
+            "status": status.value,
+            "completed_at": completed_at.isoformat() if completed_at else None
+        }
+        for order_id in order_ids
+    ]
+
+
+def format_sse(item) -> str:
+    seq, token, payload = item
+    return f"id: {token}\nevent: {payload['type']}\ndata: {json.dumps(payload)}\n\n"
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session):
+    change_events.publish(session.info.pop(_PENDING_KEY, []))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,54 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from app.models.inventory_daily_aggregate import InventoryDailyAggregate
+from app.models.material import Material
+
+# Trailing windows (in days, today included) reported for every material
+CONSUMPTION_WINDOWS = (1, 7, 30)
+
+
+def consumption_report(db: Session, today: date | None = None) -> list[dict]:
+    """
+    Burn rate and days of cover of every material, from the daily aggregates.
+
+    One statement reads at most 30 aggregate rows per material: deductions over the
+    trailing 1, 7 and 30 days (today included) and restocks over 30 days.
+    `days_of_cover` is `quantity / avg_daily_deduction` over 30 days, or `None` when
+    nothing was deducted in that time.
+    """
+    today = today or datetime.utcnow().date()
+    longest = max(CONSUMPTION_WINDOWS)
+    day = InventoryDailyAggregate.day
+    windows = (
+        select(
+            InventoryDailyAggregate.material_id,
+            *(
+                func.sum(case((day > today - timedelta(days=days), InventoryDailyAggregate.deducted), else_=0.0))
+                .label(f"deducted_{days}d")
+                for days in CONSUMPTION_WINDOWS
+            ),
+            func.sum(InventoryDailyAggregate.restocked).label(f"restocked_{longest}d"),
+        )
+        .where(day > today - timedelta(days=longest), day <= today)
+        .group_by(InventoryDailyAggregate.material_id)
+        .subquery()
+    )
+    totals = [column for column in windows.c if column.name != "material_id"]
+    rows = db.execute(
+        select(Material.id, Material.name, Material.unit, Material.quantity,
+               *(func.coalesce(column, 0.0).label(column.name) for column in totals))
+        .outerjoin(windows, windows.c.material_id == Material.id)
+        .order_by(Material.id)
+    ).all()
+
+    report = []
+    for row in rows:
+        entry = row._asdict()
+        entry["material_id"] = entry.pop("id")
+        entry["quantity"] = entry["quantity"] or 0.0
+        avg_daily = entry[f"deducted_{longest}d"] / longest
+        entry["avg_daily_deduction"] = round(avg_daily, 4)
+        entry["days_of_cover"] = round(entry["quantity"] / avg_daily, 1) if avg_daily > 0 else None
+        report.append(entry)
+    return report
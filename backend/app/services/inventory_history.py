@@ -0,0 +1,210 @@
+import logging
+import re
+from datetime import date, datetime, timedelta
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.inventory_daily_aggregate import InventoryDailyAggregate
+from app.models.inventory_log import InventoryChangeLog, ChangeType
+from app.services.stock_snapshots import take_snapshot
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "inventory_logs_y"
+_PARTITION_NAME = re.compile(r"^inventory_logs_y(\d{4})m(\d{2})$")
+
+def month_start(moment: datetime | date) -> date:
+    return date(moment.year, moment.month, 1)
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month.year:04d}m{month.month:02d}"
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _create_partition(connection, month: date) -> None:
+    """
+    Create the partition of one month, moving its rows out of the default partition.
+
+    Rows land in `inventory_logs_default` only when their month had no partition yet;
+    PostgreSQL refuses to create a partition whose range the default one already holds.
+    Does nothing if the partition exists.
+    """
+    bounds = {"start": month, "end": next_month(month)}
+    name = partition_name(month)
+    if connection.scalar(text("SELECT to_regclass(:name)"), {"name": name}) is not None:
+        return
+    connection.execute(text(f"CREATE TEMP TABLE IF NOT EXISTS {name}_moved (LIKE inventory_logs) ON COMMIT DROP"))
+    connection.execute(text(
+        f"WITH moved AS (DELETE FROM inventory_logs_default "
+        f"WHERE timestamp >= :start AND timestamp < :end RETURNING *) "
+        f"INSERT INTO {name}_moved SELECT * FROM moved"
+    ), bounds)
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF inventory_logs "
+        f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+    ))
+    connection.execute(text(f"INSERT INTO inventory_logs SELECT * FROM {name}_moved"))
+
+
+def ensure_log_partitions(db: Session, months_ahead: int | None = None, now: datetime | None = None) -> list[str]:
+    """
+    Create the monthly ledger partitions from the current month to `months_ahead` later.
+
+    PostgreSQL only (a no-op elsewhere). Run at startup and by the maintenance job,
+    never from the write path: creating a partition locks the whole ledger. A short
+    lock timeout makes it give up instead of queueing every ledger reader and writer
+    behind it; rows for a month without a partition go to the default partition and
+    are moved once it exists. Commits; returns the partition names checked.
+    """
+    if not _is_postgres(db):
+        return []
+    months_ahead = settings.INVENTORY_LOG_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+    month = month_start(now or datetime.utcnow())
+    names = []
+    db.execute(text("SET LOCAL lock_timeout = '2s'"))
+    for _ in range(months_ahead + 1):
+        _create_partition(db.connection(), month)
+        names.append(partition_name(month))
+        month = next_month(month)
+    db.commit()
+    return names
+
+
+def prepare_log_partitions() -> list[str]:
+    """
+    Startup hook: create the upcoming ledger partitions, logging instead of failing.
+
+    A busy ledger or a database that is not up yet must not keep the API from starting;
+    the default partition takes the rows until the maintenance job catches up.
+    """
+    try:
+        with SessionLocal() as db:
+            return ensure_log_partitions(db)
+    except DBAPIError:
+        logger.warning("Could not create upcoming ledger partitions; rows go to the default partition")
+        return []
+
+
+def record_daily_aggregates(db: Session, entries: list[dict]) -> None:
+    """
+    Fold freshly written ledger rows into their per-material daily aggregates.
+
+    Called with every ledger insert, in the same transaction, so the aggregates are
+    always current and never need a ledger scan. One upsert per (material, day)
+    touched, in material order; `closing_balance` is the last entry's `remaining`.
+    """
+    days: dict[tuple, dict] = {}
+    for entry in entries:
+        key = (entry["material_id"], entry["timestamp"].date())
+        day = days.setdefault(key, {
+            "material_id": key[0], "day": key[1], "restocked": 0.0, "deducted": 0.0, "entries": 0
+        })
+        if entry["change_type"] == ChangeType.RESTOCK:
+            day["restocked"] += entry["quantity"]
+        else:
+            day["deducted"] += entry["quantity"]
+        day["entries"] += 1
+        day["closing_balance"] = entry["remaining"]
+    if not days:
+        return
+
+    insert = pg_insert if _is_postgres(db) else sqlite_insert
+    stmt = insert(InventoryDailyAggregate)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[InventoryDailyAggregate.material_id, InventoryDailyAggregate.day],
+            set_={
+                "restocked": InventoryDailyAggregate.restocked + stmt.excluded.restocked,
+                "deducted": InventoryDailyAggregate.deducted + stmt.excluded.deducted,
+                "entries": InventoryDailyAggregate.entries + stmt.excluded.entries,
+                "closing_balance": stmt.excluded.closing_balance,
+            }
+        ),
+        [days[key] for key in sorted(days)]
+    )
+
+
+def rollup_inventory_logs(db: Session, now: datetime | None = None) -> dict:
+    """
+    Drop ledger months older than the retention period.
+
+    Their history is already in `inventory_daily_aggregates`, which is maintained as
+    ledger rows are written. The cutoff is the start of the month containing
+    `now - INVENTORY_LOG_RETENTION_DAYS`, so whole months go at once and, on
+    PostgreSQL, their partitions are dropped instead of deleted row by row. A stock
+    snapshot is taken at the cutoff first, so `stock_as_of` stays exact for any time
+    after it. Running it again for the same cutoff changes nothing.
+    """
+    now = now or datetime.utcnow()
+    cutoff = month_start(now - timedelta(days=settings.INVENTORY_LOG_RETENTION_DAYS))
+    cutoff_at = datetime.combine(cutoff, datetime.min.time())
+    take_snapshot(db, cutoff_at)
+
+    dropped = []
+    if _is_postgres(db):
+        for name in db.scalars(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'inventory_logs'::regclass"
+        )).all():
+            match = _PARTITION_NAME.match(name)
+            if match and next_month(date(int(match[1]), int(match[2]), 1)) <= cutoff:
+                db.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+    # Rows left in the default partition (or every old row, without partitioning)
+    deleted = db.execute(
+        delete(InventoryChangeLog)
+        .where(InventoryChangeLog.timestamp < cutoff_at)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return {
+        "cutoff": cutoff_at.isoformat(),
+        "dropped_partitions": dropped,
+        "deleted_rows": deleted,
+    }
+
+
+def daily_history(db: Session, material_id: int | None, since: date | None, until: date | None) -> list[dict]:
+    """
+    Per-material daily totals over any range, oldest first, from the daily aggregates.
+
+    Covers the whole history, including months already dropped from the ledger.
+    `since` is inclusive, `until` exclusive.
+    """
+    conditions = []
+    if material_id is not None:
+        conditions.append(InventoryDailyAggregate.material_id == material_id)
+    if since is not None:
+        conditions.append(InventoryDailyAggregate.day >= since)
+    if until is not None:
+        conditions.append(InventoryDailyAggregate.day < until)
+    return [
+        row._asdict()
+        for row in db.execute(
+            select(InventoryDailyAggregate.material_id, InventoryDailyAggregate.day,
+                   InventoryDailyAggregate.restocked, InventoryDailyAggregate.deducted,
+                   InventoryDailyAggregate.closing_balance, InventoryDailyAggregate.entries)
+            .where(*conditions)
+            .order_by(InventoryDailyAggregate.day, InventoryDailyAggregate.material_id)
+        )
+    ]
+
+
+if __name__ == "__main__":
+    import app.models  # noqa: F401
+
+    with SessionLocal() as session:
+        print(f"Ledger partitions checked: {', '.join(ensure_log_partitions(session)) or 'none'}")
+        print(f"Rollup: {rollup_inventory_logs(session)}")
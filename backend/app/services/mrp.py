@@ -0,0 +1,100 @@
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.material import Material
+from app.models.production_order import ProductionOrder, ProductionStatus
+from app.utils.bom_explosion import BoMGraph, get_bom_graph
+
+# Demand within this margin of stock is not reported as a shortfall (float noise)
+SHORTFALL_EPSILON = 1e-9
+
+
+def bom_matrix(graph: BoMGraph, product_ids: list[int], material_index: dict[int, int]):
+    """
+    Flattened BoM of `product_ids` as a sparse matrix in coordinate form.
+
+    Returns `(rows, cols, per_unit)` arrays: entry k says product `product_ids[rows[k]]`
+    needs `per_unit[k]` of the material at column `cols[k]` of `material_index`.
+    Entries are ordered by row. Raises `BoMCycleError` on component loops.
+    """
+    rows, cols, per_unit = [], [], []
+    for row, product_id in enumerate(product_ids):
+        for material_id, qty in graph.flatten(product_id).items():
+            col = material_index.get(material_id)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+                per_unit.append(qty)
+    return (
+        np.array(rows, dtype=np.int64),
+        np.array(cols, dtype=np.int64),
+        np.array(per_unit, dtype=np.float64),
+    )
+
+
+def run_mrp(db: Session, shortfall_only: bool = False) -> dict:
+    """
+    Material requirements for every PLANNED production order.
+
+    The (multi-level, flattened) BoM of the planned products is laid out once as a
+    sparse product x material matrix in coordinate form. Demand is that matrix
+    multiplied by the vector of planned batch sizes per product, computed with a
+    single `np.bincount`, so the cost is linear in the number of BoM entries.
+    Raises `BoMCycleError` if a planned product's components form a loop.
+    """
+    orders = db.execute(
+        select(ProductionOrder.id, ProductionOrder.product_id, ProductionOrder.batch_size)
+        .where(ProductionOrder.status == ProductionStatus.PLANNED)
+        .order_by(ProductionOrder.id)
+    ).all()
+    materials = db.execute(
+        select(Material.id, Material.name, Material.unit, Material.quantity).order_by(Material.id)
+    ).all()
+
+    result = {"planned_orders": len(orders), "affected_orders": [], "materials": []}
+    if not orders or not materials:
+        return result
+
+    order_ids = np.array([o.id for o in orders], dtype=np.int64)
+    batch_sizes = np.array([o.batch_size for o in orders], dtype=np.float64)
+    products, order_product = np.unique(
+        np.array([o.product_id for o in orders], dtype=np.int64), return_inverse=True
+    )
+    planned = np.bincount(order_product, weights=batch_sizes, minlength=len(products))
+
+    material_index = {m.id: i for i, m in enumerate(materials)}
+    rows, cols, per_unit = bom_matrix(get_bom_graph(db), products.tolist(), material_index)
+
+    demand = np.bincount(cols, weights=per_unit * planned[rows], minlength=len(materials))
+    on_hand = np.array([m.quantity or 0.0 for m in materials], dtype=np.float64)
+    shortfall = np.maximum(demand - on_hand, 0.0)
+    short = shortfall > SHORTFALL_EPSILON
+
+    # Orders grouped by product, so each short BoM entry expands to a slice of order IDs
+    by_product = np.argsort(order_product, kind="stable")
+    bounds = np.searchsorted(order_product[by_product], np.arange(len(products) + 1))
+    short_entries = np.flatnonzero(short[cols])
+    starts = bounds[rows[short_entries]]
+    counts = bounds[rows[short_entries] + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    # (material, order) pairs are already unique: one BoM entry per product and material
+    pair_cols = np.repeat(cols[short_entries], counts)
+    pair_orders = order_ids[by_product[offsets]]
+    ordering = np.lexsort((pair_orders, pair_cols))
+    pair_cols, pair_orders = pair_cols[ordering], pair_orders[ordering]
+    pair_bounds = np.searchsorted(pair_cols, np.arange(len(materials) + 1))
+
+    for col in np.flatnonzero(short if shortfall_only else demand > 0).tolist():
+        material = materials[col]
+        result["materials"].append({
+            "material_id": material.id,
+            "name": material.name,
+            "unit": material.unit,
+            "demand": round(float(demand[col]), 4),
+            "on_hand": float(on_hand[col]),
+            "shortfall": round(float(shortfall[col]), 4),
+            "affected_orders": pair_orders[pair_bounds[col]:pair_bounds[col + 1]].tolist()
+        })
+
+    result["affected_orders"] = np.unique(pair_orders).tolist()
+    return result
@@ -1,45 +1,59 @@
+from collections import defaultdict
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from datetime import datetime
-from app.models.production_order import ProductionOrder
+from app.models.production_order import ProductionOrder, ProductionStatus
 from app.models.bom import BillOfMaterial
-from app.models.material import Material
-from app.models.inventory_log import InventoryChangeLog, ChangeType
+from app.models.inventory_log import ChangeType
 from app.models.production_audit_log import ProductionAuditLog
+from app.services.change_events import order_events, queue_change_events
+from app.services.stock_movements import lock_materials, apply_stock_changes, record_ledger_entries
 
 def deduct_for_production_order(order: ProductionOrder, db: Session):
-    bom_items = db.query(BillOfMaterial).filter(BillOfMaterial.product_id == order.product_id).all()
-    if not bom_items:
-        raise HTTPException(status_code=400, detail="No BoM defined for this product")
+    """
+    Deduct the materials of one production order and mark it complete.
 
-    for item in bom_items:
-        required_qty = item.quantity * order.batch_size
-        material = db.query(Material).filter(Material.id == item.material_id).first()
+    Materials are locked in ascending ID order, then decremented with one conditional
+    `UPDATE ... RETURNING`; ledger `remaining` values come from RETURNING.
+    """
+    needs = defaultdict(float)
+    for material_id, quantity in db.execute(
+        select(BillOfMaterial.material_id, BillOfMaterial.quantity)
+        .where(BillOfMaterial.product_id == order.product_id)
+        .order_by(BillOfMaterial.id)
+    ):
+        needs[material_id] += quantity * order.batch_size
+    if not needs:
+        raise HTTPException(status_code=400, detail="No BoM defined for this product")
 
+    stock = lock_materials(db, sorted(needs))
+    for material_id, required_qty in needs.items():
+        material = stock.get(material_id)
         if not material:
-            raise HTTPException(status_code=404, detail=f"Material ID {item.material_id} not found")
+            raise HTTPException(status_code=404, detail=f"Material ID {material_id} not found")
         if material.quantity < required_qty:
             raise HTTPException(
                 status_code=400,
                 detail=f"Insufficient stock for {material.name}: requires {required_qty}, has {material.quantity}"
             )
 
-        material.quantity -= required_qty
-
-        db.add(InventoryChangeLog(
-            material_id=material.id,
-            production_order_id=order.id,
-            change_type=ChangeType.DEDUCTION,
-            quantity=required_qty,
-            remaining=material.quantity,
-            note=f"Deduction for production order #{order.id}"
-        ))
-
-    # Automatically update order status
-    if order.status == "planned":
-        order.status = "in_progress"
-    order.status = "complete"
+    remaining = apply_stock_changes(db, {material_id: -qty for material_id, qty in needs.items()})
+    record_ledger_entries(db, [
+        {
+            "material_id": material_id,
+            "production_order_id": order.id,
+            "change_type": ChangeType.DEDUCTION,
+            "quantity": required_qty,
+            "remaining": remaining[material_id],
+            "note": f"Deduction for production order #{order.id}"
+        }
+        for material_id, required_qty in needs.items()
+    ])
+
+    order.status = ProductionStatus.COMPLETE
     order.completed_at = datetime.utcnow()
+    queue_change_events(db, order_events([order.id], order.status, order.completed_at))
 
     db.add(ProductionAuditLog(
         production_order_id=order.id,
@@ -48,3 +62,113 @@ def deduct_for_production_order(order: ProductionOrder, db: Session):
     ))
 
     db.commit()
+
+
+def deduct_for_production_orders(order_ids: list[int], db: Session) -> list[dict]:
+    """
+    Deduct materials for many production orders in one transaction.
+
+    Orders are processed in the given order against a single locked snapshot of
+    stock: each order either gets all of its materials or is reported as
+    insufficient, without affecting the orders that can be fulfilled. Every
+    material is locked once, and stock, ledger, order and audit writes are bulk
+    statements; ledger `remaining` values are derived from the quantities RETURNING
+    reports. Returns one result per requested order ID.
+    """
+    requested = list(dict.fromkeys(order_ids))
+    orders = {
+        order.id: order
+        for order in db.query(ProductionOrder)
+        .filter(ProductionOrder.id.in_(requested))
+        .order_by(ProductionOrder.id)
+        .with_for_update()
+    }
+
+    # Per-unit BoM of every product involved, in one query
+    bom = defaultdict(list)
+    product_ids = {order.product_id for order in orders.values()}
+    if product_ids:
+        for product_id, material_id, quantity in db.execute(
+            select(BillOfMaterial.product_id, BillOfMaterial.material_id, BillOfMaterial.quantity)
+            .where(BillOfMaterial.product_id.in_(product_ids))
+        ):
+            bom[product_id].append((material_id, quantity))
+
+    stock = lock_materials(db, {material_id for lines in bom.values() for material_id, _ in lines})
+    available = {material_id: row.quantity for material_id, row in stock.items()}
+
+    results = []
+    fulfilled = []
+    changes = defaultdict(float)
+    ledger = []
+    for order_id in requested:
+        order = orders.get(order_id)
+        if order is None:
+            results.append({"order_id": order_id, "status": "not_found", "detail": "Production order not found"})
+            continue
+        if order.status == ProductionStatus.COMPLETE:
+            results.append({"order_id": order_id, "status": "skipped", "detail": "Production order already complete"})
+            continue
+        if not bom[order.product_id]:
+            results.append({"order_id": order_id, "status": "no_bom", "detail": "No BoM defined for this product"})
+            continue
+
+        needs = defaultdict(float)
+        for material_id, quantity in bom[order.product_id]:
+            needs[material_id] += quantity * order.batch_size
+
+        insufficient = [
+            {
+                "material_id": material_id,
+                "material": stock[material_id].name if material_id in stock else None,
+                "required": required,
+                "available": available.get(material_id, 0.0)
+            }
+            for material_id, required in needs.items()
+            if available.get(material_id, 0.0) < required
+        ]
+        if insufficient:
+            results.append({"order_id": order_id, "status": "insufficient", "insufficient": insufficient})
+            continue
+
+        for material_id, required in needs.items():
+            available[material_id] -= required
+            changes[material_id] -= required
+            ledger.append({
+                "material_id": material_id,
+                "production_order_id": order_id,
+                "change_type": ChangeType.DEDUCTION,
+                "quantity": required,
+                "note": f"Deduction for production order #{order_id}"
+            })
+        fulfilled.append(order_id)
+        results.append({"order_id": order_id, "status": "deducted"})
+
+    if fulfilled:
+        # Ledger balances walk down from the stored post-update quantities (RETURNING),
+        # like the single-order path, so they match the materials table exactly
+        stored = apply_stock_changes(db, changes)
+        running = {material_id: stored[material_id] - delta for material_id, delta in changes.items()}
+        for entry in ledger:
+            running[entry["material_id"]] -= entry["quantity"]
+            entry["remaining"] = running[entry["material_id"]]
+        record_ledger_entries(db, ledger)
+        completed_at = datetime.utcnow()
+        db.execute(
+            update(ProductionOrder)
+            .where(ProductionOrder.id.in_(fulfilled))
+            .values(status=ProductionStatus.COMPLETE, completed_at=completed_at)
+            .execution_options(synchronize_session=False)
+        )
+        queue_change_events(db, order_events(fulfilled, ProductionStatus.COMPLETE, completed_at))
+        db.execute(insert(ProductionAuditLog), [
+            {
+                "production_order_id": order_id,
+                "action": "completed",
+                "note": "Auto-complete after batch deduction"
+            }
+            for order_id in fulfilled
+        ])
+
+    db.commit()
+    return results
@@ -0,0 +1,95 @@
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.services.auth_utils import SECRET_KEY
+
+
+class RefreshTokenError(Exception):
+    """
+    Raised when a refresh token is unknown, expired, revoked or reused.
+    """
+
+
+def _token_hash(token: str) -> str:
+    return hmac.new(SECRET_KEY.encode(), token.encode(), hashlib.sha256).hexdigest()
+
+
+def issue_refresh_token(db: Session, user_id: int, family_id: str | None = None) -> str:
+    """
+    Create a refresh token for a user and return its plaintext value.
+
+    Only the HMAC of the token is stored. Tokens rotated from the same login share
+    `family_id` so a reused token can revoke the whole chain. The caller commits.
+    """
+    token = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        user_id=user_id,
+        token_hash=_token_hash(token),
+        family_id=family_id or secrets.token_hex(16),
+        expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    ))
+    return token
+
+
+def revoke_token_family(db: Session, family_id: str) -> None:
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+
+
+def rotate_refresh_token(db: Session, token: str) -> tuple[str, str]:
+    """
+    Exchange a refresh token for a new one; returns `(username, new_token)`.
+
+    One indexed lookup by token hash, then a guarded UPDATE revokes the old token so
+    two concurrent refreshes cannot both succeed. Presenting an already revoked token
+    is treated as theft and revokes every token of its family. Commits on return.
+    """
+    now = datetime.utcnow()
+    row = db.execute(
+        select(RefreshToken.id, RefreshToken.user_id, RefreshToken.family_id,
+               RefreshToken.expires_at, RefreshToken.revoked_at, User.username)
+        .join(User, User.id == RefreshToken.user_id)
+        .where(RefreshToken.token_hash == _token_hash(token))
+    ).first()
+
+    if row is None or row.expires_at <= now:
+        raise RefreshTokenError("Invalid refresh token")
+
+    if row.revoked_at is not None:
+        revoke_token_family(db, row.family_id)
+        db.commit()
+        raise RefreshTokenError("Refresh token reuse detected")
+
+    result = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == row.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+    )
+    if result.rowcount != 1:
+        db.rollback()
+        raise RefreshTokenError("Invalid refresh token")
+
+    new_token = issue_refresh_token(db, row.user_id, row.family_id)
+    db.commit()
+    return row.username, new_token
+
+
+def revoke_refresh_token(db: Session, token: str) -> None:
+    """
+    Revoke the family of a refresh token (logout). Unknown tokens are ignored.
+    """
+    family_id = db.execute(
+        select(RefreshToken.family_id).where(RefreshToken.token_hash == _token_hash(token))
+    ).scalar_one_or_none()
+    if family_id is not None:
+        revoke_token_family(db, family_id)
+        db.commit()
@@ -0,0 +1,195 @@
+import math
+from datetime import datetime
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.orm import Session
+from app.models.bom import BillOfMaterial
+from app.models.material import Material
+from app.models.inventory_log import InventoryChangeLog, ChangeType
+from app.services.change_events import material_events, queue_change_events
+from app.services.inventory_history import record_daily_aggregates
+from app.services.table_versions import bump_table_versions
+
+
+def lock_bom_materials(db: Session, product_id: int) -> list:
+    """
+    Read every BoM line of a product together with its material in one statement.
+
+    The material rows are locked (`SELECT ... FOR UPDATE OF materials`) in ascending
+    ID order so concurrent deductions always acquire locks in the same sequence.
+    BoM lines pointing at a missing material are dropped by the inner join.
+    """
+    stmt = (
+        select(
+            Material.id,
+            Material.name,
+            Material.quantity,
+            BillOfMaterial.quantity.label("per_unit"),
+        )
+        .join(BillOfMaterial, BillOfMaterial.material_id == Material.id)
+        .where(BillOfMaterial.product_id == product_id)
+        .order_by(Material.id)
+        .with_for_update(of=Material)
+    )
+    return db.execute(stmt).all()
+
+
+def lock_materials(db: Session, material_ids) -> dict:
+    """
+    Lock a set of materials (`SELECT ... FOR UPDATE`) in ascending ID order.
+
+    Returns `{material_id: row}` where each row has `id`, `name` and `quantity`.
+    """
+    if not material_ids:
+        return {}
+    stmt = (
+        select(Material.id, Material.name, Material.quantity)
+        .where(Material.id.in_(material_ids))
+        .order_by(Material.id)
+        .with_for_update()
+    )
+    return {row.id: row for row in db.execute(stmt)}
+
+
+class StockConflictError(Exception):
+    """
+    Raised when a guarded stock update did not apply to every material it targeted.
+    """
+
+
+def apply_stock_changes(db: Session, changes: dict[int, float]) -> dict[int, float]:
+    """
+    Apply signed quantity changes to many materials with a single UPDATE ... RETURNING.
+
+    `changes` maps material ID to the delta to add (negative for deductions). The
+    arithmetic happens in the database (`quantity = quantity + delta`), guarded with
+    `WHERE quantity + delta >= 0`, so concurrent writers never lose an update and a
+    row can never go negative. The low-stock flag is recomputed in the same
+    statement, and its change time is only moved when the new quantity crosses the
+    reorder point. Marks the `materials` table version for a bump at commit (ETag
+    caching) and stages a `material` change event for the live stream. Returns
+    `{material_id: new_quantity}` from RETURNING; raises `StockConflictError` if any
+    targeted row was not updated.
+    """
+    if not changes:
+        return {}
+
+    delta = case(changes, value=Material.id, else_=0.0)
+    new_quantity = Material.quantity + delta
+    is_low = new_quantity < func.coalesce(Material.reorder_point, 0.0)
+    rows = db.execute(
+        update(Material)
+        .where(Material.id.in_(changes.keys()), new_quantity >= 0)
+        .values(
+            quantity=new_quantity,
+            is_low_stock=is_low,
+            low_stock_changed_at=case(
+                (Material.is_low_stock != is_low, datetime.utcnow()),
+                else_=Material.low_stock_changed_at
+            )
+        )
+        .returning(Material.id, Material.quantity, Material.is_low_stock)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if len(rows) != len(changes):
+        raise StockConflictError("Stock changed while it was being updated")
+    bump_table_versions(db, "materials")
+    queue_change_events(db, material_events(rows))
+    return {row.id: row.quantity for row in rows}
+
+
+def record_ledger_entries(db: Session, entries: list[dict]) -> None:
+    """
+    Insert inventory ledger rows with one executemany INSERT.
+
+    Rows are stamped with one timestamp and folded into the daily aggregates behind
+    `/logs/inventory/daily` and `/materials/consumption/` in the same transaction.
+    """
+    if entries:
+        now = datetime.utcnow()
+        entries = [{"timestamp": now, **entry} for entry in entries]
+        db.execute(insert(InventoryChangeLog), entries)
+        record_daily_aggregates(db, entries)
+
+
+def deduct_for_product(db: Session, product_id: int, batch_size: int, note: str) -> list[dict]:
+    """
+    Deduct the materials needed for `batch_size` units of a product.
+
+    Runs a fixed number of statements regardless of BoM size: one read of the BoM
+    materials that locks them in ascending ID order (so concurrent deductions cannot
+    deadlock), one conditional `UPDATE ... RETURNING` and one bulk ledger insert.
+    Returns the list of insufficient materials; when it is non-empty nothing is changed.
+    """
+    lines = lock_bom_materials(db, product_id)
+
+    required = {}
+    insufficient = []
+    for line in lines:
+        required_qty = round(line.per_unit * batch_size, 2)
+        required[line.id] = required_qty
+        if line.quantity < required_qty:
+            insufficient.append({
+                "material": line.name,
+                "required": required_qty,
+                "available": line.quantity
+            })
+
+    if insufficient:
+        return insufficient
+
+    remaining = apply_stock_changes(db, {material_id: -qty for material_id, qty in required.items()})
+    record_ledger_entries(db, [
+        {
+            "material_id": line.id,
+            "change_type": ChangeType.DEDUCTION,
+            "quantity": required[line.id],
+            "remaining": remaining[line.id],
+            "note": note
+        }
+        for line in lines
+    ])
+    return []
+
+
+def restock_materials(db: Session, lines: list[dict]) -> list[dict]:
+    """
+    Apply a receiving manifest: many `{material_id, quantity, note}` lines at once.
+
+    Invalid lines (unknown material, quantity not a positive finite number) are reported
+    and skipped; the rest are applied with one sorted lock read, one `UPDATE ... RETURNING`
+    and one executemany ledger insert. Each line gets its own ledger row whose `remaining`
+    is the running total in manifest order. Returns one result per line, in order.
+    """
+    stock = lock_materials(db, {line["material_id"] for line in lines})
+
+    results = []
+    changes: dict[int, float] = {}
+    applied = []
+    for line in lines:
+        material = stock.get(line["material_id"])
+        if material is None:
+            results.append({"material_id": line["material_id"], "status": "error", "detail": "Material not found"})
+        elif not math.isfinite(line["quantity"]) or line["quantity"] <= 0:
+            # NaN and inf would corrupt materials.quantity (and NaN >= 0 holds on PostgreSQL)
+            results.append({"material_id": line["material_id"], "status": "error", "detail": "Quantity must be a positive, finite number"})
+        else:
+            changes[material.id] = changes.get(material.id, 0.0) + line["quantity"]
+            applied.append((line, len(results)))
+            results.append({"material_id": material.id, "material": material.name, "status": "restocked"})
+
+    apply_stock_changes(db, changes)
+
+    running = {material_id: stock[material_id].quantity for material_id in changes}
+    entries = []
+    for line, index in applied:
+        running[line["material_id"]] += line["quantity"]
+        results[index]["remaining"] = running[line["material_id"]]
+        entries.append({
+            "material_id": line["material_id"],
+            "change_type": ChangeType.RESTOCK,
+            "quantity": line["quantity"],
+            "remaining": running[line["material_id"]],
+            "note": line.get("note") or "Manual restock"
+        })
+    record_ledger_entries(db, entries)
+    return results
@@ -0,0 +1,56 @@
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.models.table_version import TableVersion
+
+
+_PENDING_KEY = "pending_table_versions"
+
+
+def bump_table_versions(db: Session, *names: str) -> None:
+    """
+    Mark the named tables as written by the caller's transaction.
+
+    Call it from every write path of a cached table. The counters themselves are
+    incremented by the `before_commit` hook below, once per table, as the last
+    statements of the transaction: each counter row is a single hot row, so its lock
+    is held only for the commit itself, never while the rest of the transaction runs.
+    Nothing is bumped if the transaction rolls back.
+    """
+    db.info.setdefault(_PENDING_KEY, set()).update(names)
+
+
+def _increment_table_versions(db: Session, names: set[str]) -> None:
+    # One upsert per table in name order, so a missing counter row is created on first write
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    for name in sorted(names):
+        stmt = insert(TableVersion).values(name=name, version=1)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[TableVersion.name],
+            set_={"version": TableVersion.version + 1}
+        ))
+
+
+def get_table_versions(db: Session, *names: str) -> dict[str, int]:
+    """
+    Current version of each named table; tables never written to report 0.
+    """
+    versions = dict(db.execute(
+        select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(names))
+    ).all())
+    return {name: versions.get(name, 0) for name in names}
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_before_commit(session):
+    names = session.info.pop(_PENDING_KEY, None)
+    if names:
+        # Flush the transaction's own writes first so the counters really go last
+        session.flush()
+        _increment_table_versions(session, names)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
@@ -1,26 +1,87 @@
+import threading
+from typing import NamedTuple
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.bom import BillOfMaterial
+from app.models.material import Material
+from app.utils.cache import LRUCache
+
+class BoMLine(NamedTuple):
+    material_id: int
+    name: str
+    unit: str
+    quantity: float
+
+# BoMs are read on every calculation but written rarely (`crud.bom.create_bom`),
+# so each product's lines are cached until that product's BoM changes. The generation
+# stops a read that raced with an invalidation from caching the lines it loaded before.
+_bom_lines_cache = LRUCache(maxsize=settings.BOM_CACHE_SIZE)
+_lock = threading.Lock()
+_generation = 0
+
+def get_bom_lines(db: Session, product_id: int) -> tuple[BoMLine, ...]:
+    lines = _bom_lines_cache.get(product_id)
+    if lines is None:
+        generation = _generation
+        rows = db.execute(
+            select(BillOfMaterial.material_id, Material.name, Material.unit, BillOfMaterial.quantity)
+            .outerjoin(Material, Material.id == BillOfMaterial.material_id)
+            .where(BillOfMaterial.product_id == product_id)
+            .order_by(BillOfMaterial.id)
+        ).all()
+        lines = tuple(
+            BoMLine(
+                material_id=row.material_id,
+                name=row.name if row.name is not None else f"Material #{row.material_id}",
+                unit=row.unit if row.name is not None else "",
+                quantity=float(row.quantity)
+            )
+            for row in rows
+        )
+        with _lock:
+            if _generation == generation:
+                _bom_lines_cache.set(product_id, lines)
+    return lines
+
+def invalidate_bom_lines(product_id: int | None = None) -> None:
+    global _generation
+    with _lock:
+        _generation += 1
+        if product_id is None:
+            _bom_lines_cache.clear()
+        else:
+            _bom_lines_cache.pop(product_id)
 
 def calculate_materials_for_batch(db: Session, product_id: int, batch_size: int = 1, check_availability: bool = False) -> dict:
-    boms = db.query(BillOfMaterial).filter(BillOfMaterial.product_id == product_id).all()
+    lines = get_bom_lines(db, product_id)
+
+    # Stock changes constantly, so it is never cached: one batched read for all lines
+    stock = {}
+    if lines:
+        stock = dict(db.execute(
+            select(Material.id, Material.quantity).where(Material.id.in_([line.material_id for line in lines]))
+        ).all())
+
     results = {}
+    needed = {}
     insufficient = {}
 
-    for bom in boms:
-        material_name = bom.material.name if bom.material else f"Material #{bom.material_id}"
-        required_qty = round(bom.quantity * batch_size, 2)
-        available_qty = bom.material.quantity if bom.material else 0
+    for line in lines:
+        required_qty = round(line.quantity * batch_size, 2)
+        available_qty = stock.get(line.material_id, 0)
 
-        results[material_name] = {
+        needed[line.name] = required_qty
+        results[line.name] = {
             "required": required_qty,
             "available": available_qty,
-            "unit": bom.material.unit if bom.material else "",
+            "unit": line.unit,
             "status": "ok"
         }
 
         if check_availability and available_qty < required_qty:
-            results[material_name]["status"] = "insufficient"
-            insufficient[material_name] = {
+            results[line.name]["status"] = "insufficient"
+            insufficient[line.name] = {
                 "required": required_qty,
                 "available": available_qty
             }
@@ -28,6 +89,7 @@ def calculate_materials_for_batch(db: Session, product_id: int, batch_size: int
     return {
         "product_id": product_id,
         "batch_size": batch_size,
+        "materials_needed": needed,
         "materials": results,
         "insufficient": insufficient if check_availability else None
     }
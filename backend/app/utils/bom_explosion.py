@@ -0,0 +1,146 @@
+import threading
+from collections import defaultdict
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.bom import BillOfMaterial, ProductComponent
+
+
+class BoMCycleError(ValueError):
+    """
+    Raised when product components form a loop (a product ends up containing itself).
+    """
+    def __init__(self, cycle: list[int]):
+        self.cycle = cycle
+        super().__init__("BoM cycle detected: " + " -> ".join(f"product {p}" for p in cycle))
+
+
+class BoMGraph:
+    """
+    In-memory copy of the whole multi-level BoM.
+
+    `materials[p]` maps material ID to quantity per unit of product `p`, and
+    `components[p]` maps sub-assembly product ID to quantity per unit of `p`.
+    `flattened` memoizes each product's total per-unit material vector.
+    """
+    def __init__(self, materials: dict[int, dict[int, float]], components: dict[int, dict[int, float]]):
+        self.materials = materials
+        self.components = components
+        self.flattened: dict[int, dict[int, float]] = {}
+
+    def find_path(self, start: int, target: int) -> list[int] | None:
+        """
+        Component path from `start` down to `target`, or None if `target` is not inside `start`.
+        """
+        parents = {start: None}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            if node == target:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                return path[::-1]
+            for component_id in self.components.get(node, {}):
+                if component_id not in parents:
+                    parents[component_id] = node
+                    stack.append(component_id)
+        return None
+
+    def flatten(self, root: int) -> dict[int, float]:
+        """
+        Total material quantity per unit of `root`, across every sub-assembly level.
+
+        Iterative post-order DFS: each sub-assembly is exploded once and memoized,
+        so shared components are not re-walked. Raises `BoMCycleError` on loops.
+        """
+        memo = self.flattened
+        if root in memo:
+            return memo[root]
+
+        path: list[int] = []
+        on_path: set[int] = set()
+        stack = [(root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if children_done:
+                path.pop()
+                on_path.discard(node)
+                vector = dict(self.materials.get(node, {}))
+                for component_id, per_unit in self.components.get(node, {}).items():
+                    for material_id, qty in memo[component_id].items():
+                        vector[material_id] = vector.get(material_id, 0.0) + per_unit * qty
+                memo[node] = vector
+                continue
+
+            if node in memo:
+                continue
+
+            path.append(node)
+            on_path.add(node)
+            stack.append((node, True))
+            for component_id in self.components.get(node, {}):
+                if component_id in on_path:
+                    raise BoMCycleError(path[path.index(component_id):] + [component_id])
+                if component_id not in memo:
+                    stack.append((component_id, False))
+
+        return memo[root]
+
+
+# Process-wide cache. BoM writes call `invalidate_bom_graph()`; the generation counter
+# stops a load that raced with an invalidation from installing a stale graph.
+_lock = threading.Lock()
+_graph: BoMGraph | None = None
+_generation = 0
+
+
+def _load_graph(db: Session) -> BoMGraph:
+    materials: dict[int, dict[int, float]] = defaultdict(dict)
+    for product_id, material_id, quantity in db.execute(
+        select(BillOfMaterial.product_id, BillOfMaterial.material_id, BillOfMaterial.quantity)
+    ):
+        materials[product_id][material_id] = float(quantity)
+
+    components: dict[int, dict[int, float]] = defaultdict(dict)
+    for product_id, component_id, quantity in db.execute(
+        select(ProductComponent.product_id, ProductComponent.component_id, ProductComponent.quantity)
+    ):
+        components[product_id][component_id] = float(quantity)
+
+    return BoMGraph(dict(materials), dict(components))
+
+
+def get_bom_graph(db: Session) -> BoMGraph:
+    """
+    Return the cached BoM graph, loading it with two queries when cold.
+    """
+    global _graph
+    graph = _graph
+    if graph is not None:
+        return graph
+
+    generation = _generation
+    graph = _load_graph(db)
+    with _lock:
+        if _generation == generation:
+            _graph = graph
+    return graph
+
+
+def invalidate_bom_graph() -> None:
+    """
+    Drop the cached graph and every memoized explosion. Call after any BoM write.
+    """
+    global _graph, _generation
+    with _lock:
+        _graph = None
+        _generation += 1
+
+
+def explode_product(db: Session, product_id: int, batch_size: float = 1) -> dict[int, float]:
+    """
+    Total raw materials needed for `batch_size` units of a product, as {material_id: quantity}.
+    """
+    vector = get_bom_graph(db).flatten(product_id)
+    return {material_id: round(qty * batch_size, 4) for material_id, qty in vector.items()}
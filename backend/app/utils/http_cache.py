@@ -0,0 +1,53 @@
+import hashlib
+from functools import lru_cache
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.services.table_versions import get_table_versions
+from app.utils.cache import LRUCache
+
+# Serialized response bodies keyed by ETag. The ETag embeds the table versions, so a
+# write makes old entries unreachable and the LRU ages them out.
+response_cache = LRUCache(maxsize=max(settings.RESPONSE_CACHE_SIZE, 1))
+
+
+def compute_etag(db: Session, request: Request, *tables: str) -> str:
+    """
+    Weak ETag for a GET whose body depends only on `tables` and the request URL.
+
+    Costs one primary-key read of `table_versions`, never a read of the tables themselves.
+    """
+    versions = get_table_versions(db, *tables)
+    key = "|".join([request.url.path, str(request.query_params)] + [f"{t}={versions[t]}" for t in tables])
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """
+    A 304 response if the client's `If-None-Match` already matches `etag`, else None.
+    """
+    candidates = {tag.strip() for tag in request.headers.get("if-none-match", "").split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+def cached_json_response(etag: str, schema, build) -> Response:
+    """
+    JSON list response for `etag`, running and serializing `build()` only on a cache miss.
+
+    `build()` returns ORM rows (or schema instances) that are validated as `list[schema]`.
+    """
+    body = response_cache.get(etag) if settings.RESPONSE_CACHE_SIZE > 0 else None
+    if body is None:
+        adapter = _list_adapter(schema)
+        body = adapter.dump_json(adapter.validate_python(build(), from_attributes=True))
+        if settings.RESPONSE_CACHE_SIZE > 0:
+            response_cache.set(etag, body)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
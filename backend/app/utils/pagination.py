@@ -0,0 +1,25 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(timestamp: datetime, id: int) -> str:
+    """
+    Encode a `(timestamp, id)` keyset position as an opaque URL-safe cursor.
+    """
+    payload = json.dumps({"ts": timestamp.isoformat(), "id": id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Raises `ValueError` if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["ts"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
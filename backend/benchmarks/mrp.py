@@ -0,0 +1,78 @@
+"""
+MRP benchmark: 5,000 planned orders against a 3,000-material catalog.
+
+Seeds an in-memory SQLite database (1,000 products, 25 materials each, some products
+built from sub-assemblies) and times `run_mrp` with a cold and a warm BoM cache.
+
+    python benchmarks/mrp.py --orders 5000 --materials 3000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.db.database import Base  # noqa: E402
+from app.models.bom import BillOfMaterial, ProductComponent  # noqa: E402
+from app.models.material import Material  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.models.production_order import ProductionOrder, ProductionStatus  # noqa: E402
+from app.services.mrp import run_mrp  # noqa: E402
+from app.utils.bom_explosion import invalidate_bom_graph  # noqa: E402
+
+
+def seed(db, orders: int, materials: int, products: int, lines: int) -> None:
+    rng = random.Random(42)
+    db.execute(insert(Material), [
+        {"name": f"M{i}", "quantity": rng.uniform(0, 500), "unit": "yards"} for i in range(1, materials + 1)
+    ])
+    db.execute(insert(Product), [{"name": f"P{i}", "quantity": 0, "price": 1.0} for i in range(1, products + 1)])
+    db.execute(insert(BillOfMaterial), [
+        {"product_id": p, "material_id": m, "quantity": rng.uniform(0.1, 3)}
+        for p in range(1, products + 1)
+        for m in rng.sample(range(1, materials + 1), lines)
+    ])
+    # Every tenth product also uses two lower-numbered products as sub-assemblies
+    db.execute(insert(ProductComponent), [
+        {"product_id": p, "component_id": c, "quantity": 2.0}
+        for p in range(20, products + 1, 10)
+        for c in (p - 1, p - 2)
+    ])
+    db.execute(insert(ProductionOrder), [
+        {"product_id": rng.randint(1, products), "batch_size": rng.randint(1, 50), "status": ProductionStatus.PLANNED}
+        for _ in range(orders)
+    ])
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--materials", type=int, default=3000)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=25, help="BoM lines per product")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    seed(db, args.orders, args.materials, args.products, args.lines)
+
+    invalidate_bom_graph()
+    for label in ("cold BoM cache", "warm BoM cache"):
+        start = time.perf_counter()
+        result = run_mrp(db)
+        elapsed = (time.perf_counter() - start) * 1000
+        short = sum(1 for m in result["materials"] if m["shortfall"] > 0)
+        print(f"{label}: {elapsed:.1f} ms ({result['planned_orders']} orders, "
+              f"{len(result['materials'])} materials with demand, {short} short)")
+
+
+if __name__ == "__main__":
+    main()
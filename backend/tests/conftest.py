@@ -1,7 +1,16 @@
+import os
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+
+# Point the application engine at SQLite before any app module is imported
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+
 from app.db.database import Base
+from app.dependencies.auth import invalidate_principal
+from app.utils.bom import invalidate_bom_lines
+from app.utils.bom_explosion import invalidate_bom_graph
+from app.utils.http_cache import response_cache
 
 # Create a test database in memory
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -15,3 +24,12 @@ def db():
     yield db
     db.close()
     Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Every test rebuilds the schema, so product IDs, usernames and table versions repeat across tests
+    invalidate_bom_lines()
+    invalidate_bom_graph()
+    invalidate_principal()
+    response_cache.clear()
+    yield
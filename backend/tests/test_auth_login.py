@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api import auth, user_management
+from app.db.database import Base, engine, SessionLocal
+from app.models.user import User
+from app.services import auth_utils
+from app.services.auth_utils import PasswordHashExecutor, PasswordHasherBusy, create_access_token
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+def credentials(password="secret"):
+    return {"username": "maker", "email": "maker@example.com", "full_name": "Maker", "password": password}
+
+def test_register_and_login(db):
+    assert client.post("/auth/register", json=credentials()).status_code == 200
+
+    response = client.post("/auth/login", json=credentials())
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+
+    assert client.post("/auth/login", json=credentials("wrong")).status_code == 401
+
+    operations = client.get("/health/auth").json()["operations"]
+    assert operations["hash"]["count"] >= 1
+    assert operations["verify"]["count"] >= 2
+
+def test_login_returns_503_when_hasher_is_saturated(db, monkeypatch):
+    client.post("/auth/register", json=credentials())
+
+    async def busy(*args):
+        raise PasswordHasherBusy()
+
+    monkeypatch.setattr(auth, "verify_password_async", busy)
+    response = client.post("/auth/login", json=credentials())
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+def test_admin_user_creation_uses_the_bounded_hasher(db, monkeypatch):
+    db.add(User(username="admin1", hashed_password="x", role="admin"))
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'admin1'})}"}
+
+    response = client.post("/users/", json=credentials(), headers=headers)
+    assert response.status_code == 200
+    assert client.post("/auth/login", json=credentials()).status_code == 200
+
+    async def busy(*args):
+        raise PasswordHasherBusy()
+
+    monkeypatch.setattr(user_management, "hash_password_async", busy)
+    response = client.post("/users/", json={**credentials(), "username": "maker2", "email": "maker2@example.com"}, headers=headers)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+def test_executor_rejects_beyond_queue_limit():
+    hasher = PasswordHashExecutor(workers=1, max_queue=0)
+    hasher._slots.acquire()
+
+    with pytest.raises(PasswordHasherBusy):
+        asyncio.run(hasher.run("hash", auth_utils.hash_password, "secret"))
+
+    hasher._slots.release()
+    hashed = asyncio.run(hasher.run("hash", auth_utils.hash_password, "secret"))
+    assert auth_utils.verify_password("secret", hashed)
+    assert hasher.snapshot()["rejected"] == 1
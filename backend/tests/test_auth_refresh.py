@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import select
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api import auth
+from app.db.database import Base, engine, SessionLocal
+from app.models.refresh_token import RefreshToken
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    client.post("/auth/register", json={
+        "username": "maker", "email": None, "full_name": None, "password": "secret"
+    })
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+def login():
+    response = client.post("/auth/login", json={
+        "username": "maker", "email": None, "full_name": None, "password": "secret"
+    })
+    assert response.status_code == 200
+    return response.json()
+
+def test_refresh_rotates_without_password_check(db, monkeypatch):
+    tokens = login()
+
+    async def no_bcrypt(*args):
+        raise AssertionError("refresh must not verify a password")
+
+    monkeypatch.setattr(auth, "verify_password_async", no_bcrypt)
+    response = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == 200
+    renewed = response.json()
+    assert renewed["refresh_token"] != tokens["refresh_token"]
+    assert client.get("/inventory/", headers={"Authorization": f"Bearer {renewed['access_token']}"}).status_code == 200
+
+    stored = db.execute(select(RefreshToken.token_hash)).scalars().all()
+    assert tokens["refresh_token"] not in stored
+
+def test_reused_token_revokes_the_family(db):
+    tokens = login()
+    renewed = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+
+    reuse = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert reuse.status_code == 401
+
+    # The legitimate successor is revoked along with the stolen token
+    assert client.post("/auth/refresh", json={"refresh_token": renewed["refresh_token"]}).status_code == 401
+
+def test_logout_revokes_refresh_token(db):
+    tokens = login()
+    assert client.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]}).status_code == 204
+    assert client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+def test_unknown_token_is_rejected(db):
+    assert client.post("/auth/refresh", json={"refresh_token": "nope"}).status_code == 401
@@ -0,0 +1,92 @@
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import Base, engine, async_engine, SessionLocal, get_db, get_read_db
+from app.dependencies.auth import get_current_user
+from app.dependencies.roles import require_roles
+from app.dependencies.auth import invalidate_principal
+from app.models.user import User
+from app.services.auth_utils import create_access_token
+
+client = TestClient(app)
+
+# Routes that declare the user before the session, unlike the application's own routes
+user_first = FastAPI()
+
+@user_first.get("/whoami")
+def whoami(current_user: User = Depends(get_current_user), db=Depends(get_db)):
+    return {"users": db.query(User).count(), "username": current_user.username}
+
+@user_first.get("/admin-only")
+def admin_only(current_user: User = Depends(require_roles("admin")), db=Depends(get_read_db)):
+    return {"ok": True}
+
+user_first_client = TestClient(user_first)
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    db.add(User(username="operator1", hashed_password="x", role="operator"))
+    db.commit()
+
+    yield db
+
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.mark.parametrize("method, path, body", [
+    ("get", "/materials/", None),
+    ("post", "/materials/", {"name": "Thread", "quantity": 5.0, "unit": "spools"}),
+    # Depends on `get_read_db`: the AsyncSession when DB_ASYNC_ENABLED is set
+    ("get", "/production_orders/", None),
+])
+def test_authenticated_request_holds_one_connection(db, method, path, body):
+    assert_one_connection(client, method, path, body)
+
+def test_user_declared_before_session_shares_it(db):
+    response, checkouts = assert_one_connection(user_first_client, "get", "/whoami", None)
+    assert response.json() == {"users": 1, "username": "operator1"}
+    # The user lookup did not run on a separate, short-lived session
+    assert checkouts == 1
+
+def test_rejected_user_declared_first_releases_the_session(db):
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'operator1'})}"}
+    invalidate_principal()
+    assert user_first_client.get("/admin-only", headers=headers).status_code == 403
+    pools = [engine.pool] + ([async_engine.sync_engine.pool] if async_engine is not None else [])
+    assert sum(pool.checkedout() for pool in pools) == 0
+
+def assert_one_connection(client, method, path, body):
+    token = create_access_token(data={"sub": "operator1"})
+    held, peak, total = [0], [0], [0]
+
+    def on_checkout(*args):
+        total[0] += 1
+        held[0] += 1
+        peak[0] = max(peak[0], held[0])
+
+    def on_checkin(*args):
+        held[0] -= 1
+
+    # Count across both engines, whichever one the route's session is bound to
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+    invalidate_principal()
+    for bind in engines:
+        event.listen(bind, "checkout", on_checkout)
+        event.listen(bind, "checkin", on_checkin)
+    try:
+        kwargs = {"json": body} if body is not None else {}
+        response = getattr(client, method)(path, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+    finally:
+        for bind in engines:
+            event.remove(bind, "checkout", on_checkout)
+            event.remove(bind, "checkin", on_checkin)
+
+    assert response.status_code == 200
+    # A write may check its connection out again after committing, but never holds two
+    assert peak[0] == 1
+    return response, total[0]
@@ -2,6 +2,7 @@ import pytest
 from app.models.product import Product
 from app.models.material import Material
 from app.models.bom import BillOfMaterial
+from app.models.inventory_log import InventoryChangeLog
 from fastapi.testclient import TestClient
 from app.main import app
 from app.db.database import Base, engine, SessionLocal
@@ -40,3 +41,12 @@ def test_insufficient_inventory_deduction(db):
     response = client.post("/bom/deduct/?product_id=1&batch_size=10")
     assert response.status_code == 422
     assert "insufficient" in response.json()["detail"]
+
+def test_insufficient_deduction_changes_nothing(db):
+    response = client.post("/bom/deduct/?product_id=1&batch_size=10")
+    assert response.status_code == 422
+
+    db.expire_all()
+    quantities = {m.name: m.quantity for m in db.query(Material).all()}
+    assert quantities == {"Cloth": 10.0, "Zipper": 5.0}
+    assert db.query(InventoryChangeLog).count() == 0
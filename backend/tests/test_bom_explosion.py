@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy import event
+from app.models.product import Product
+from app.models.material import Material
+from app.models.bom import BillOfMaterial, ProductComponent
+from app.schemas.bom import ProductComponentCreate
+from app.crud.bom import create_component
+from app.utils.bom_explosion import BoMCycleError, explode_product
+
+def _kit(db):
+    # kit = 2 x pouch + 1 x tag; pouch = 1 x strap + 0.5 fabric; strap = 1.5 fabric + 1 buckle
+    products = {name: Product(name=name, quantity=0, price=1.0) for name in ["Kit", "Pouch", "Strap", "Tag"]}
+    materials = {name: Material(name=name, quantity=100, unit="pcs") for name in ["Fabric", "Buckle", "Card"]}
+    db.add_all(list(products.values()) + list(materials.values()))
+    db.commit()
+
+    db.add_all([
+        ProductComponent(product_id=products["Kit"].id, component_id=products["Pouch"].id, quantity=2),
+        ProductComponent(product_id=products["Kit"].id, component_id=products["Tag"].id, quantity=1),
+        ProductComponent(product_id=products["Pouch"].id, component_id=products["Strap"].id, quantity=1),
+        BillOfMaterial(product_id=products["Pouch"].id, material_id=materials["Fabric"].id, quantity=0.5),
+        BillOfMaterial(product_id=products["Strap"].id, material_id=materials["Fabric"].id, quantity=1.5),
+        BillOfMaterial(product_id=products["Strap"].id, material_id=materials["Buckle"].id, quantity=1),
+        BillOfMaterial(product_id=products["Tag"].id, material_id=materials["Card"].id, quantity=1),
+    ])
+    db.commit()
+    return products, materials
+
+def test_explosion_flattens_all_levels(db):
+    products, materials = _kit(db)
+
+    result = explode_product(db, products["Kit"].id, batch_size=10)
+    assert result == {
+        materials["Fabric"].id: 40.0,
+        materials["Buckle"].id: 20.0,
+        materials["Card"].id: 10.0,
+    }
+
+def test_repeat_explosion_is_served_from_cache(db):
+    products, _ = _kit(db)
+    kit_id, pouch_id = products["Kit"].id, products["Pouch"].id
+    explode_product(db, kit_id)
+
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    explode_product(db, kit_id, batch_size=3)
+    explode_product(db, pouch_id, batch_size=7)
+    assert statements == []
+
+def test_component_creating_cycle_is_rejected(db):
+    products, _ = _kit(db)
+
+    with pytest.raises(BoMCycleError) as exc:
+        create_component(db, ProductComponentCreate(
+            product_id=products["Strap"].id,
+            component_id=products["Kit"].id,
+            quantity=1
+        ))
+    assert exc.value.cycle == [products["Strap"].id, products["Kit"].id, products["Pouch"].id, products["Strap"].id]
+
+def test_cycle_in_stored_data_is_detected(db):
+    products, _ = _kit(db)
+    db.add(ProductComponent(product_id=products["Strap"].id, component_id=products["Pouch"].id, quantity=1))
+    db.commit()
+
+    with pytest.raises(BoMCycleError):
+        explode_product(db, products["Kit"].id)
+
+def test_new_component_invalidates_cached_explosion(db):
+    products, materials = _kit(db)
+    assert explode_product(db, products["Tag"].id) == {materials["Card"].id: 1.0}
+
+    create_component(db, ProductComponentCreate(
+        product_id=products["Tag"].id,
+        component_id=products["Strap"].id,
+        quantity=2
+    ))
+    assert explode_product(db, products["Tag"].id) == {
+        materials["Card"].id: 1.0,
+        materials["Fabric"].id: 3.0,
+        materials["Buckle"].id: 2.0,
+    }
@@ -1,7 +1,10 @@
 from app.models.product import Product
 from app.models.material import Material
 from app.models.bom import BillOfMaterial
-from app.utils.bom import calculate_materials_for_batch
+from app.utils.bom import calculate_materials_for_batch, get_bom_lines, invalidate_bom_lines, _bom_lines_cache
+from app.crud.bom import create_bom
+from app.schemas.bom import BoMCreate
+from sqlalchemy import event
 
 def test_calculate_materials_for_batch(db):
     product = Product(name="Test Product", description="A test product", quantity=100, price=10.0)
@@ -104,3 +107,50 @@ def test_availability_some_insufficient(db):
     assert "Dye" in result["insufficient"]
     assert result["insufficient"]["Dye"]["required"] == 4.0
     assert result["insufficient"]["Dye"]["available"] == 3
+
+def test_bom_lines_are_cached_until_bom_changes(db):
+    product = Product(name="Cached Product", description="Cache test", quantity=1, price=1.0)
+    fabric = Material(name="Canvas", description="Cached", quantity=40, unit="yards")
+    thread = Material(name="Waxed Thread", description="Added later", quantity=10, unit="spools")
+    db.add_all([product, fabric, thread])
+    db.commit()
+    product_id, fabric_id, thread_id = product.id, fabric.id, thread.id
+
+    create_bom(db, BoMCreate(product_id=product_id, material_id=fabric_id, quantity=2.0))
+    calculate_materials_for_batch(db, product_id=product_id, batch_size=1)
+
+    statements = []
+
+    def count_statement(*args):
+        statements.append(args[2])
+
+    event.listen(db.get_bind(), "before_cursor_execute", count_statement)
+    result = calculate_materials_for_batch(db, product_id=product_id, batch_size=3)
+    event.remove(db.get_bind(), "before_cursor_execute", count_statement)
+    assert len(statements) == 1  # only the batched stock read
+    assert result["materials"]["Canvas"] == {"required": 6.0, "available": 40, "unit": "yards", "status": "ok"}
+
+    create_bom(db, BoMCreate(product_id=product_id, material_id=thread_id, quantity=1.0))
+    result = calculate_materials_for_batch(db, product_id=product_id, batch_size=3)
+    assert result["materials_needed"] == {"Canvas": 6.0, "Waxed Thread": 3.0}
+
+def test_read_racing_a_bom_write_does_not_cache_stale_lines(db):
+    product = Product(name="Raced Product", description="Race test", quantity=1, price=1.0)
+    felt = Material(name="Wool Felt", description="Raced", quantity=10, unit="sheets")
+    db.add_all([product, felt])
+    db.commit()
+    product_id = product.id
+
+    def write_commits_mid_read(*args):
+        # A BoM write commits (and invalidates) while this read's query is in flight
+        invalidate_bom_lines(product_id)
+
+    event.listen(db.get_bind(), "before_cursor_execute", write_commits_mid_read)
+    try:
+        assert get_bom_lines(db, product_id) == ()
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", write_commits_mid_read)
+    assert _bom_lines_cache.get(product_id) is None
+
+    create_bom(db, BoMCreate(product_id=product_id, material_id=felt.id, quantity=1.5))
+    assert [line.quantity for line in get_bom_lines(db, product_id)] == [1.5]
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api import events as events_api
+from app.api.events import event_stream
+from app.db.database import Base, engine, async_engine, SessionLocal
+from app.dependencies.auth import invalidate_principal
+from app.models.product import Product
+from app.models.material import Material
+from app.models.bom import BillOfMaterial
+from app.models.production_order import ProductionOrder
+from app.models.user import User
+from app.services.auth_utils import create_access_token
+from app.services.change_events import ChangeEventBroker, change_events
+from app.services.stock_movements import apply_stock_changes
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    tote = Product(name="Tote", quantity=0, price=20.0)
+    canvas = Material(name="Canvas", quantity=10.0, unit="yards", reorder_point=5.0)
+    db.add_all([tote, canvas, User(username="operator1", hashed_password="x", role="operator")])
+    db.commit()
+    db.add_all([
+        BillOfMaterial(product_id=tote.id, material_id=canvas.id, quantity=2.0),
+        ProductionOrder(product_id=tote.id, batch_size=3),
+    ])
+    db.commit()
+
+    yield db
+
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+def auth_headers():
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': 'operator1'})}"}
+
+def events_since(token):
+    position, events = change_events.replay(token)
+    return [payload for _, _, payload in events]
+
+class DisconnectingRequest:
+    async def is_disconnected(self):
+        return True
+
+async def collect(resume_token):
+    return [frame async for frame in event_stream(DisconnectingRequest(), resume_token)]
+
+def test_committed_changes_are_published_in_order(db):
+    token = change_events.token(change_events.position())
+
+    client.post("/materials/restock/", json={"material_id": 1, "quantity": 4.0})
+    client.put("/production_orders/1/status", params={"status": "in_progress"}, headers=auth_headers())
+    client.post("/production_orders/1/deduct/", headers=auth_headers())
+
+    events = events_since(token)
+    assert events[:3] == [
+        {"type": "material", "id": 1, "quantity": 14.0, "is_low_stock": False},
+        {"type": "production_order", "id": 1, "status": "in_progress", "completed_at": None},
+        {"type": "material", "id": 1, "quantity": 8.0, "is_low_stock": False},
+    ]
+    assert events[3]["status"] == "complete"
+    assert events[3]["completed_at"] is not None
+    assert len(events) == 4
+
+def test_rolled_back_changes_are_not_published(db):
+    token = change_events.token(change_events.position())
+
+    apply_stock_changes(db, {1: 5.0})
+    db.rollback()
+    assert events_since(token) == []
+
+    apply_stock_changes(db, {1: 5.0})
+    db.commit()
+    assert events_since(token) == [{"type": "material", "id": 1, "quantity": 15.0, "is_low_stock": False}]
+
+def test_stream_replays_missed_events_after_resume_token(db):
+    token = change_events.token(change_events.position())
+    client.post("/materials/restock/", json={"material_id": 1, "quantity": 1.0})
+
+    frames = asyncio.run(collect(token))
+    assert len(frames) == 1
+    lines = frames[0].splitlines()
+    assert lines[0] == f"id: {change_events.token(change_events.position())}"
+    assert lines[1] == "event: material"
+    assert json.loads(lines[2].removeprefix("data: "))["quantity"] == 11.0
+
+def test_stream_starts_with_ready_or_reset(db):
+    frames = asyncio.run(collect(None))
+    assert frames == [f"id: {change_events.token(change_events.position())}\nevent: ready\ndata: {{}}\n\n"]
+
+    frames = asyncio.run(collect("stale-token"))
+    assert "event: reset" in frames[0]
+
+def test_replay_rejects_tokens_outside_the_buffer():
+    broker = ChangeEventBroker(buffer_size=2)
+    start = broker.token(0)
+    broker.publish([{"type": "material", "id": n} for n in range(3)])
+
+    assert broker.replay(start) == (3, None)
+    assert [payload["id"] for _, _, payload in broker.replay(broker.token(1))[1]] == [1, 2]
+    assert broker.replay(broker.token(3)) == (3, [])
+    assert broker.replay(broker.token(4))[1] is None
+    assert broker.replay("other-1")[1] is None
+
+def test_open_stream_holds_no_pooled_connection(db, monkeypatch):
+    async def probe(request, resume_token):
+        pools = [engine.pool] + ([async_engine.sync_engine.pool] if async_engine is not None else [])
+        yield f"checked out: {sum(pool.checkedout() for pool in pools)}"
+
+    # A principal-cache miss makes the auth layer query the users table
+    invalidate_principal()
+    monkeypatch.setattr(events_api, "event_stream", probe)
+    response = client.get("/events/stream", headers=auth_headers())
+    assert response.status_code == 200
+    assert response.text == "checked out: 0"
@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import Base, engine, SessionLocal
+from app.models.material import Material
+from app.models.user import User
+from app.models.table_version import TableVersion
+from app.services.stock_movements import restock_materials
+from app.services.auth_utils import create_access_token
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add_all([
+        Material(name="Felt", quantity=4.0, unit="sheets"),
+        User(username="admin1", hashed_password="x", role="admin"),
+    ])
+    db.commit()
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+def record_statements():
+    statements = []
+
+    def record(*args):
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", record)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", record)
+
+def test_unchanged_products_return_304_without_reading_rows(db):
+    client.post("/products/", json={"name": "Tote", "quantity": 1, "price": 9.5})
+    first = client.get("/products/")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    statements, stop = record_statements()
+    try:
+        repeat = client.get("/products/", headers={"If-None-Match": etag})
+    finally:
+        stop()
+
+    assert repeat.status_code == 304
+    assert repeat.headers["ETag"] == etag
+    assert not [sql for sql in statements if "FROM products" in sql]
+
+    client.post("/products/", json={"name": "Pouch", "quantity": 1, "price": 4.0})
+    changed = client.get("/products/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert [p["name"] for p in changed.json()] == ["Tote", "Pouch"]
+
+def test_query_parameters_are_part_of_the_etag(db):
+    assert client.get("/locations/").headers["ETag"] != client.get("/locations/?limit=1").headers["ETag"]
+
+def test_restock_changes_materials_etag(db):
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'admin1'})}"}
+    etag = client.get("/materials/", headers=headers).headers["ETag"]
+    assert client.get("/materials/", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    client.post("/materials/restock/", json={"material_id": 1, "quantity": 2})
+
+    response = client.get("/materials/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["quantity"] == 6.0
+
+def test_table_version_is_bumped_last_and_only_on_commit(db):
+    db.add(Material(name="Ribbon", quantity=1.0, unit="spools"))
+    db.commit()
+
+    statements, stop = record_statements()
+    try:
+        # Two stock writes in one transaction: the shared counter row is touched once, at commit
+        restock_materials(db, [{"material_id": 1, "quantity": 2.0}])
+        restock_materials(db, [{"material_id": 2, "quantity": 3.0}])
+        assert not [sql for sql in statements if "table_versions" in sql]
+        db.commit()
+    finally:
+        stop()
+
+    assert [sql for sql in statements if "table_versions" in sql] == [statements[-1]]
+    assert db.get(TableVersion, "materials").version == 1
+
+    restock_materials(db, [{"material_id": 1, "quantity": 2.0}])
+    db.rollback()
+    db.commit()
+    assert db.get(TableVersion, "materials").version == 1
+
+def test_cached_body_is_reused_for_the_same_version(db):
+    client.get("/bom/")
+
+    statements, stop = record_statements()
+    try:
+        response = client.get("/bom/")
+    finally:
+        stop()
+
+    assert response.status_code == 200
+    assert not [sql for sql in statements if "FROM bill_of_materials" in sql]
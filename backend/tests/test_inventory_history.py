@@ -0,0 +1,112 @@
+import pytest
+from datetime import date, datetime
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.db.database import Base, engine, SessionLocal
+from app.models.material import Material
+from app.models.inventory_log import InventoryChangeLog, ChangeType
+from app.models.inventory_daily_aggregate import InventoryDailyAggregate
+from app.models.user import User
+from app.services.auth_utils import create_access_token
+from app.services import inventory_history
+from app.services.inventory_history import next_month, partition_name, rollup_inventory_logs
+from app.services.stock_movements import record_ledger_entries
+from app.services.stock_snapshots import stock_as_of
+
+client = TestClient(app)
+
+NOW = datetime(2025, 7, 15, 12, 0, 0)
+
+@pytest.fixture(scope="function")
+def db(monkeypatch):
+    monkeypatch.setattr(settings, "INVENTORY_LOG_RETENTION_DAYS", 90)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    felt = Material(name="Felt", quantity=0.0, unit="sheets")
+    db.add_all([felt, User(username="admin1", hashed_password="x", role="admin")])
+    db.commit()
+
+    # (timestamp, type, quantity) applied in order; the cutoff for NOW is 2025-04-01
+    changes = [
+        (datetime(2025, 3, 3, 9, 0), ChangeType.RESTOCK, 50.0),
+        (datetime(2025, 3, 3, 15, 0), ChangeType.DEDUCTION, 10.0),
+        (datetime(2025, 3, 3, 16, 0), ChangeType.DEDUCTION, 5.0),
+        (datetime(2025, 3, 20, 8, 0), ChangeType.RESTOCK, 20.0),
+        (datetime(2025, 4, 2, 10, 0), ChangeType.DEDUCTION, 15.0),
+        (datetime(2025, 7, 1, 10, 0), ChangeType.RESTOCK, 5.0),
+    ]
+    balance = 0.0
+    for timestamp, change_type, quantity in changes:
+        balance += quantity if change_type == ChangeType.RESTOCK else -quantity
+        record_ledger_entries(db, [{"material_id": felt.id, "change_type": change_type, "quantity": quantity,
+                                    "remaining": balance, "timestamp": timestamp}])
+    felt.quantity = balance
+    db.commit()
+
+    yield db
+
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+def test_ledger_writes_maintain_daily_aggregates(db):
+    days = db.query(InventoryDailyAggregate).order_by(InventoryDailyAggregate.day).all()
+    assert [(d.day, d.restocked, d.deducted, d.closing_balance, d.entries) for d in days] == [
+        (date(2025, 3, 3), 50.0, 15.0, 35.0, 3),
+        (date(2025, 3, 20), 20.0, 0.0, 55.0, 1),
+        (date(2025, 4, 2), 0.0, 15.0, 40.0, 1),
+        (date(2025, 7, 1), 5.0, 0.0, 45.0, 1),
+    ]
+
+def test_rollup_drops_months_before_cutoff(db):
+    result = rollup_inventory_logs(db, now=NOW)
+    assert result["cutoff"] == "2025-04-01T00:00:00"
+    assert result["deleted_rows"] == 4
+    assert db.query(InventoryChangeLog).count() == 2
+    assert db.query(InventoryDailyAggregate).count() == 4
+
+    # The snapshot at the cutoff keeps point-in-time reads exact without the old rows
+    assert stock_as_of(db, datetime(2025, 4, 1)) == {1: 55.0}
+    assert stock_as_of(db, datetime(2025, 4, 3)) == {1: 40.0}
+
+    # Running it again for the same cutoff changes nothing
+    assert rollup_inventory_logs(db, now=NOW)["deleted_rows"] == 0
+
+def test_daily_history_outlives_the_ledger(db):
+    rollup_inventory_logs(db, now=NOW)
+
+    response = client.get("/logs/inventory/daily", params={"material_id": 1})
+    assert response.status_code == 200
+    assert [(d["day"], d["closing_balance"]) for d in response.json()] == [
+        ("2025-03-03", 35.0),
+        ("2025-03-20", 55.0),
+        ("2025-04-02", 40.0),
+        ("2025-07-01", 45.0),
+    ]
+
+    response = client.get("/logs/inventory/daily", params={"since": "2025-03-10", "until": "2025-07-01"})
+    assert [d["day"] for d in response.json()] == ["2025-03-20", "2025-04-02"]
+
+def test_rollup_endpoint_is_admin_only(db):
+    response = client.post("/logs/inventory/rollup")
+    assert response.status_code == 401
+
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'admin1'})}"}
+    response = client.post("/logs/inventory/rollup", headers=headers)
+    assert response.status_code == 200
+
+def test_partition_months():
+    assert partition_name(date(2025, 4, 1)) == "inventory_logs_y2025m04"
+    assert next_month(date(2025, 12, 1)) == date(2026, 1, 1)
+
+def test_partitions_are_created_at_startup_not_on_write(db, monkeypatch):
+    calls = []
+    monkeypatch.setattr(inventory_history, "ensure_log_partitions", lambda session: calls.append(session) or [])
+
+    with TestClient(app):
+        assert len(calls) == 1
+
+    record_ledger_entries(db, [{"material_id": 1, "change_type": ChangeType.RESTOCK, "quantity": 1.0, "remaining": 46.0}])
+    db.commit()
+    assert len(calls) == 1
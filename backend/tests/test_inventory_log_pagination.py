@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import Base, engine, SessionLocal
+from app.models.material import Material
+from app.models.inventory_log import InventoryChangeLog, ChangeType
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    felt = Material(name="Felt", quantity=100.0, unit="sheets")
+    ribbon = Material(name="Ribbon", quantity=100.0, unit="yards")
+    db.add_all([felt, ribbon])
+    db.commit()
+
+    start = datetime(2025, 4, 1, 12, 0, 0)
+    for i in range(7):
+        db.add(InventoryChangeLog(
+            material_id=felt.id,
+            change_type=ChangeType.DEDUCTION if i % 2 else ChangeType.RESTOCK,
+            quantity=1.0,
+            remaining=100.0 - i,
+            note=f"Felt change {i}",
+            # Two rows share each timestamp so the id tie-breaker is exercised
+            timestamp=start + timedelta(minutes=i // 2)
+        ))
+    db.add(InventoryChangeLog(
+        material_id=ribbon.id,
+        change_type=ChangeType.RESTOCK,
+        quantity=5.0,
+        remaining=105.0,
+        timestamp=start
+    ))
+    db.commit()
+
+    yield db
+
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+def test_cursor_walks_full_ledger_without_gaps_or_duplicates(db):
+    seen = []
+    cursor = None
+    while True:
+        params = {"material_id": 1, "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/logs/inventory/", params=params)
+        assert response.status_code == 200
+        seen.extend(log["id"] for log in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+    assert seen == sorted(seen, reverse=True)
+
+def test_type_filter_with_cursor(db):
+    response = client.get("/logs/inventory/", params={"type": "deduction", "limit": 2})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert [log["change_type"] for log in first_page] == ["deduction", "deduction"]
+
+    response = client.get("/logs/inventory/", params={
+        "type": "deduction",
+        "limit": 2,
+        "cursor": response.headers["X-Next-Cursor"]
+    })
+    assert [log["note"] for log in response.json()] == ["Felt change 1"]
+    assert "X-Next-Cursor" not in response.headers
+
+def test_invalid_cursor_is_rejected(db):
+    response = client.get("/logs/inventory/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+def test_export_streams_filtered_ndjson(db):
+    response = client.get("/logs/inventory/export", params={"material_id": 1, "type": "restock"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 4
+    assert {line["change_type"] for line in lines} == {"restock"}
+    assert [line["id"] for line in lines] == sorted(line["id"] for line in lines)
+
+def test_export_csv_with_time_range(db):
+    response = client.get("/logs/inventory/export", params={
+        "format": "csv",
+        "since": "2025-04-01T12:01:00",
+        "until": "2025-04-01T12:03:00"
+    })
+    assert response.status_code == 200
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["note"] for row in rows] == ["Felt change 2", "Felt change 3", "Felt change 4", "Felt change 5"]
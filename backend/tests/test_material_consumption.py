@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import event
+from datetime import date, datetime, timedelta
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import Base, engine, async_engine, SessionLocal
+from app.models.material import Material
+from app.models.inventory_log import ChangeType
+from app.models.user import User
+from app.services.auth_utils import create_access_token
+from app.services.consumption import consumption_report
+from app.services.stock_movements import record_ledger_entries
+
+client = TestClient(app)
+
+TODAY = date(2025, 6, 30)
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    felt = Material(name="Felt", quantity=60.0, unit="sheets")
+    ribbon = Material(name="Ribbon", quantity=25.0, unit="yards")
+    db.add_all([felt, ribbon, User(username="operator1", hashed_password="x", role="operator")])
+    db.commit()
+
+    def at(days_ago):
+        return datetime.combine(TODAY - timedelta(days=days_ago), datetime.min.time()) + timedelta(hours=10)
+
+    # Felt: 2/day for the last 30 days plus one older deduction outside every window
+    entries = [
+        {"material_id": felt.id, "change_type": ChangeType.DEDUCTION, "quantity": 2.0,
+         "remaining": 100.0 - 2 * (30 - n), "timestamp": at(n)}
+        for n in range(30)
+    ]
+    entries.append({"material_id": felt.id, "change_type": ChangeType.DEDUCTION, "quantity": 50.0,
+                    "remaining": 100.0, "timestamp": at(45)})
+    entries.append({"material_id": felt.id, "change_type": ChangeType.RESTOCK, "quantity": 20.0,
+                    "remaining": 60.0, "timestamp": at(3)})
+    for entry in entries:
+        record_ledger_entries(db, [entry])
+    db.commit()
+
+    yield db
+
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+def test_burn_rate_and_days_of_cover(db):
+    felt, ribbon = consumption_report(db, today=TODAY)
+
+    assert felt["material_id"] == 1
+    assert (felt["deducted_1d"], felt["deducted_7d"], felt["deducted_30d"]) == (2.0, 14.0, 60.0)
+    assert felt["restocked_30d"] == 20.0
+    assert felt["avg_daily_deduction"] == 2.0
+    assert felt["days_of_cover"] == 30.0
+
+    # Never deducted: no burn, unbounded cover
+    assert (ribbon["deducted_30d"], ribbon["avg_daily_deduction"], ribbon["days_of_cover"]) == (0.0, 0.0, None)
+
+def test_consumption_endpoint_is_one_query(db):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    # The route reads through `get_read_db`, on the async engine when that is enabled
+    bind = async_engine.sync_engine if async_engine is not None else engine
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'operator1'})}"}
+        response = client.get("/materials/consumption/", headers=headers)
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert [m["name"] for m in response.json()] == ["Felt", "Ribbon"]
+    assert not any("inventory_logs" in statement for statement in statements)
+    assert sum("inventory_daily_aggregates" in statement for statement in statements) == 1
@@ -1,8 +1,11 @@
 import pytest
+from datetime import datetime
 from fastapi.testclient import TestClient
 from app.main import app
 from app.db.database import Base, engine, SessionLocal
 from app.models.material import Material
+from app.models.product import Product
+from app.models.bom import BillOfMaterial
 
 client = TestClient(app)
 
@@ -34,3 +37,45 @@ def test_low_stock_endpoint_returns_only_low_stock(db):
     assert "Low Stock Item" in names
     assert "Zero Stock" in names
     assert "Enough Stock" not in names
+
+def test_deduction_below_reorder_point_flags_material(db):
+    product = Product(name="Low Stock Product", quantity=0, price=1.0)
+    db.add(product)
+    db.commit()
+    enough = db.query(Material).filter(Material.name == "Enough Stock").one()
+    db.add(BillOfMaterial(product_id=product.id, material_id=enough.id, quantity=6.0))
+    db.commit()
+    before = datetime.utcnow()
+
+    response = client.post(f"/bom/deduct/?product_id={product.id}&batch_size=2")
+    assert response.status_code == 200
+
+    names = [m["name"] for m in client.get("/materials/low_stock/").json()]
+    assert "Enough Stock" in names
+
+    changed = client.get("/materials/low_stock/", params={"changed_since": before.isoformat()}).json()
+    assert [(m["name"], m["low_stock"]) for m in changed] == [("Enough Stock", True)]
+
+def test_restock_above_reorder_point_clears_flag(db):
+    low = db.query(Material).filter(Material.name == "Low Stock Item").one()
+    before = datetime.utcnow()
+
+    response = client.post("/materials/restock/", json={"material_id": low.id, "quantity": 20})
+    assert response.status_code == 200
+
+    names = [m["name"] for m in client.get("/materials/low_stock/").json()]
+    assert "Low Stock Item" not in names
+
+    changed = client.get("/materials/low_stock/", params={"changed_since": before.isoformat()}).json()
+    assert [(m["name"], m["low_stock"]) for m in changed] == [("Low Stock Item", False)]
+
+def test_only_materials_created_low_count_as_changed(db):
+    before = datetime.utcnow()
+    db.add_all([
+        Material(name="New And Stocked", quantity=50.0, unit="yards", reorder_point=10.0),
+        Material(name="New And Low", quantity=1.0, unit="yards", reorder_point=10.0)
+    ])
+    db.commit()
+
+    changed = client.get("/materials/low_stock/", params={"changed_since": before.isoformat()}).json()
+    assert [(m["name"], m["low_stock"]) for m in changed] == [("New And Low", True)]
@@ -52,3 +52,76 @@ def test_restock_with_invalid_material_id(db):
     response = client.post("/materials/restock/", json=payload)
     assert response.status_code == 404
     assert response.json()["detail"] == "Material not found"
+
+@pytest.mark.parametrize("quantity", [0, -2.5])
+def test_restock_rejects_non_positive_quantity(db, quantity):
+    response = client.post("/materials/restock/", json={"material_id": 1, "quantity": quantity})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Quantity must be a positive, finite number"
+
+    db.expire_all()
+    assert db.query(Material).one().quantity == 5.0
+    assert db.query(InventoryChangeLog).count() == 0
+
+@pytest.mark.parametrize("quantity", ["NaN", "Infinity"])
+def test_restock_rejects_non_finite_quantity(db, quantity):
+    # JSON bodies may carry the non-standard NaN/Infinity literals
+    body = f'{{"material_id": 1, "quantity": {quantity}}}'
+    response = client.post("/materials/restock/", content=body, headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
+
+    db.expire_all()
+    assert db.query(Material).one().quantity == 5.0
+
+def test_bulk_restock_json_reports_bad_lines(db):
+    db.add(Material(name="Second", quantity=1.0, unit="rolls"))
+    db.commit()
+
+    response = client.post("/materials/restock/bulk", json=[
+        {"material_id": 1, "quantity": 10, "note": "PO-7"},
+        {"material_id": 999, "quantity": 4},
+        {"material_id": 2, "quantity": 2.5},
+        {"material_id": 1, "quantity": "lots"},
+        {"material_id": 1, "quantity": 1},
+        {"material_id": 2, "quantity": -3},
+    ])
+    assert response.status_code == 200
+    data = response.json()
+    assert data["restocked"] == 3
+    assert [(e["line"], e["material_id"]) for e in data["errors"]] == [(2, 999), (4, 1), (6, 2)]
+
+    db.expire_all()
+    assert {m.id: m.quantity for m in db.query(Material).all()} == {1: 16.0, 2: 3.5}
+    logs = db.query(InventoryChangeLog).order_by(InventoryChangeLog.id).all()
+    assert [(log.material_id, log.quantity, log.remaining) for log in logs] == [
+        (1, 10.0, 15.0), (2, 2.5, 3.5), (1, 1.0, 16.0)
+    ]
+    assert logs[0].note == "PO-7"
+    assert logs[1].note == "Manual restock"
+
+def test_bulk_restock_csv(db):
+    manifest = "material_id,quantity,note\n1,2,Delivery 12\n42,1,\n\n1,3,\"Delivery, late\"\n"
+    response = client.post("/materials/restock/bulk", content=manifest, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["restocked"] == 2
+    assert data["errors"] == [{"line": 3, "material_id": 42, "detail": "Material not found"}]
+
+    db.expire_all()
+    assert db.query(Material).one().quantity == 10.0
+    assert db.query(InventoryChangeLog).order_by(InventoryChangeLog.id.desc()).first().note == "Delivery, late"
+
+def test_bulk_restock_skips_non_finite_quantities(db):
+    manifest = "material_id,quantity\n1,inf\n1,nan\n1,-inf\n1,2\n"
+    response = client.post("/materials/restock/bulk", content=manifest, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["restocked"] == 1
+    assert [e["line"] for e in data["errors"]] == [2, 3, 4]
+
+    db.expire_all()
+    assert db.query(Material).one().quantity == 7.0
+
+def test_bulk_restock_rejects_csv_without_header(db):
+    response = client.post("/materials/restock/bulk", content="1,2\n", headers={"Content-Type": "text/csv"})
+    assert response.status_code == 400
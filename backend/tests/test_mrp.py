@@ -0,0 +1,103 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import Base, engine, SessionLocal
+from app.models.product import Product
+from app.models.location import Location
+from app.models.material import Material
+from app.models.bom import BillOfMaterial, ProductComponent
+from app.models.production_order import ProductionOrder, ProductionStatus
+from app.models.user import User
+from app.services.auth_utils import create_access_token
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    tote = Product(name="Tote", quantity=0, price=20.0)
+    strap = Product(name="Strap", quantity=0, price=2.0)
+    canvas = Material(name="Canvas", quantity=10.0, unit="yards")
+    webbing = Material(name="Webbing", quantity=100.0, unit="yards")
+    unused = Material(name="Lace", quantity=5.0, unit="yards")
+    db.add_all([tote, strap, canvas, webbing, unused,
+                User(username="operator1", hashed_password="x", role="operator")])
+    db.commit()
+
+    # Tote = 1 canvas + 2 straps; Strap = 1.5 webbing
+    db.add_all([
+        BillOfMaterial(product_id=tote.id, material_id=canvas.id, quantity=1.0),
+        BillOfMaterial(product_id=strap.id, material_id=webbing.id, quantity=1.5),
+        ProductComponent(product_id=tote.id, component_id=strap.id, quantity=2.0),
+        ProductionOrder(product_id=tote.id, batch_size=8, status=ProductionStatus.PLANNED),
+        ProductionOrder(product_id=tote.id, batch_size=6, status=ProductionStatus.PLANNED),
+        ProductionOrder(product_id=strap.id, batch_size=10, status=ProductionStatus.PLANNED),
+        ProductionOrder(product_id=tote.id, batch_size=50, status=ProductionStatus.COMPLETE),
+    ])
+    db.commit()
+
+    yield db
+
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+def get_mrp(**params):
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'operator1'})}"}
+    response = client.get("/mrp/", params=params, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+def test_mrp_totals_planned_orders(db):
+    data = get_mrp()
+    assert data["planned_orders"] == 3
+
+    by_name = {m["name"]: m for m in data["materials"]}
+    assert set(by_name) == {"Canvas", "Webbing"}
+
+    assert by_name["Canvas"]["demand"] == 14.0
+    assert by_name["Canvas"]["shortfall"] == 4.0
+    # 14 totes x 2 straps x 1.5 + 10 straps x 1.5
+    assert by_name["Webbing"]["demand"] == 57.0
+    assert by_name["Webbing"]["shortfall"] == 0.0
+    assert by_name["Webbing"]["affected_orders"] == []
+
+    tote_orders = [o.id for o in db.query(ProductionOrder).filter(
+        ProductionOrder.status == ProductionStatus.PLANNED, ProductionOrder.batch_size != 10
+    ).order_by(ProductionOrder.id)]
+    assert by_name["Canvas"]["affected_orders"] == tote_orders
+    assert data["affected_orders"] == tote_orders
+
+def test_mrp_shortfall_only(db):
+    assert [m["name"] for m in get_mrp(shortfall_only=True)["materials"]] == ["Canvas"]
+
+def test_mrp_requires_operator(db):
+    assert client.get("/mrp/").status_code == 401
+
+def test_capacity_reports_limiting_material(db):
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'operator1'})}"}
+    db.add(Product(name="Pattern", quantity=0, price=1.0))
+    db.commit()
+
+    response = client.get("/mrp/capacity/", headers=headers)
+    assert response.status_code == 200
+    by_name = {p["name"]: p for p in response.json()}
+
+    # Tote: 10 canvas / 1 = 10, 100 webbing / 3 = 33 -> canvas limits
+    assert by_name["Tote"]["buildable"] == 10
+    assert by_name["Tote"]["limiting_material"]["name"] == "Canvas"
+    # Strap: 100 webbing / 1.5 = 66
+    assert by_name["Strap"]["buildable"] == 66
+    assert by_name["Pattern"]["buildable"] is None
+
+def test_capacity_filters_by_location(db):
+    shelf = Location(name="Shelf")
+    db.add(shelf)
+    db.commit()
+    db.query(Product).filter(Product.name == "Strap").update({"location_id": shelf.id})
+    db.commit()
+
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'operator1'})}"}
+    response = client.get("/mrp/capacity/", params={"location_id": shelf.id}, headers=headers)
+    assert [p["name"] for p in response.json()] == ["Strap"]
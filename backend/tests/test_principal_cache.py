@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import Base, engine, SessionLocal
+from app.models.user import User
+from app.services.auth_utils import create_access_token
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    db.add_all([
+        User(username="admin1", hashed_password="x", role="admin"),
+        User(username="viewer1", hashed_password="x", role="viewer"),
+    ])
+    db.commit()
+
+    yield db
+
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+def headers_for(username):
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': username})}"}
+
+def test_repeat_requests_skip_the_user_query(db):
+    assert client.get("/inventory/", headers=headers_for("viewer1")).status_code == 200
+
+    statements = []
+
+    def record(*args):
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/inventory/", headers=headers_for("viewer1"))
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert not [sql for sql in statements if "FROM users" in sql]
+
+def test_role_change_takes_effect_immediately(db):
+    viewer = headers_for("viewer1")
+    assert client.get("/materials/", headers=viewer).status_code == 403
+
+    viewer_id = db.query(User).filter(User.username == "viewer1").one().id
+    response = client.put(f"/users/{viewer_id}/role", json={"role": "operator"}, headers=headers_for("admin1"))
+    assert response.status_code == 200
+    assert response.json()["role"] == "operator"
+
+    assert client.get("/materials/", headers=viewer).status_code == 200
+
+def test_deleted_user_is_rejected_immediately(db):
+    viewer = headers_for("viewer1")
+    assert client.get("/inventory/", headers=viewer).status_code == 200
+
+    viewer_id = db.query(User).filter(User.username == "viewer1").one().id
+    assert client.delete(f"/users/{viewer_id}", headers=headers_for("admin1")).status_code == 200
+
+    assert client.get("/inventory/", headers=viewer).status_code == 401
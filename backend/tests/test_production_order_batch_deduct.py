@@ -0,0 +1,113 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import Base, engine, SessionLocal
+from app.models.product import Product
+from app.models.material import Material
+from app.models.bom import BillOfMaterial
+from app.models.inventory_log import InventoryChangeLog
+from app.models.production_order import ProductionOrder, ProductionStatus
+from app.models.production_audit_log import ProductionAuditLog
+from app.models.user import User
+from app.services import production_deduction
+from app.services.auth_utils import create_access_token
+from app.services.production_deduction import deduct_for_production_orders
+from app.services.stock_movements import apply_stock_changes
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    tote = Product(name="Tote", quantity=0, price=20.0)
+    canvas = Material(name="Canvas", quantity=10.0, unit="yards")
+    thread = Material(name="Thread", quantity=100.0, unit="yards")
+    db.add_all([tote, canvas, thread, User(username="operator1", hashed_password="x", role="operator")])
+    db.commit()
+
+    db.add_all([
+        BillOfMaterial(product_id=tote.id, material_id=canvas.id, quantity=1.0),
+        BillOfMaterial(product_id=tote.id, material_id=thread.id, quantity=2.0),
+        ProductionOrder(product_id=tote.id, batch_size=4),
+        ProductionOrder(product_id=tote.id, batch_size=5),
+        ProductionOrder(product_id=tote.id, batch_size=3),
+    ])
+    db.commit()
+
+    yield db
+
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+def auth_headers():
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': 'operator1'})}"}
+
+def test_batch_deducts_what_fits_and_reports_the_rest(db):
+    response = client.post(
+        "/production_orders/deduct/batch",
+        json={"order_ids": [1, 2, 3, 99]},
+        headers=auth_headers()
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    statuses = {result["order_id"]: result["status"] for result in data["results"]}
+    assert statuses == {1: "deducted", 2: "deducted", 3: "insufficient", 99: "not_found"}
+    assert data["deducted"] == 2
+    assert data["results"][2]["insufficient"][0]["material"] == "Canvas"
+    assert data["results"][2]["insufficient"][0]["available"] == 1.0
+
+    db.expire_all()
+    quantities = {m.name: m.quantity for m in db.query(Material).all()}
+    assert quantities == {"Canvas": 1.0, "Thread": 82.0}
+
+    orders = {o.id: o for o in db.query(ProductionOrder).all()}
+    assert orders[1].status == ProductionStatus.COMPLETE
+    assert orders[1].completed_at is not None
+    assert orders[3].status == ProductionStatus.PLANNED
+
+    logs = db.query(InventoryChangeLog).order_by(InventoryChangeLog.id).all()
+    assert [(log.production_order_id, log.quantity, log.remaining) for log in logs] == [
+        (1, 4.0, 6.0), (1, 8.0, 92.0), (2, 5.0, 1.0), (2, 10.0, 82.0)
+    ]
+    assert db.query(ProductionAuditLog).count() == 2
+
+def test_batch_ledger_balances_follow_the_stored_quantities(db, monkeypatch):
+    def apply_after_a_restock(session, changes):
+        # Stock moves between the locked read and the update (e.g. a restock on another path)
+        apply_stock_changes(session, {1: 5.0})
+        return apply_stock_changes(session, changes)
+
+    monkeypatch.setattr(production_deduction, "apply_stock_changes", apply_after_a_restock)
+    deduct_for_production_orders([1, 2], db)
+
+    db.expire_all()
+    canvas = db.query(Material).filter(Material.name == "Canvas").one()
+    logs = db.query(InventoryChangeLog).filter(InventoryChangeLog.material_id == canvas.id).order_by(InventoryChangeLog.id).all()
+    assert [(log.quantity, log.remaining) for log in logs] == [(4.0, 11.0), (5.0, 6.0)]
+    assert logs[-1].remaining == canvas.quantity
+
+def test_completed_orders_are_not_deducted_twice(db):
+    client.post("/production_orders/deduct/batch", json={"order_ids": [1]}, headers=auth_headers())
+    response = client.post("/production_orders/deduct/batch", json={"order_ids": [1]}, headers=auth_headers())
+
+    assert response.json()["results"] == [
+        {"order_id": 1, "status": "skipped", "detail": "Production order already complete", "insufficient": None}
+    ]
+    db.expire_all()
+    assert db.query(Material).filter(Material.name == "Canvas").one().quantity == 6.0
+
+def test_single_order_deduction_uses_returned_stock(db):
+    response = client.post("/production_orders/1/deduct/", headers=auth_headers())
+    assert response.status_code == 200
+    assert response.json()["status"] == "complete"
+
+    logs = db.query(InventoryChangeLog).order_by(InventoryChangeLog.material_id).all()
+    assert [(log.quantity, log.remaining) for log in logs] == [(4.0, 6.0), (8.0, 92.0)]
+
+    repeat = client.post("/production_orders/1/deduct/", headers=auth_headers())
+    assert repeat.status_code == 400
+    db.expire_all()
+    assert db.query(Material).filter(Material.name == "Canvas").one().quantity == 6.0
@@ -0,0 +1,95 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import Base, engine, SessionLocal
+from app.models.product import Product
+from app.models.production_order import ProductionOrder, ProductionStatus
+from app.models.user import User
+from app.services.auth_utils import create_access_token
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    tote = Product(name="Tote", quantity=0, price=20.0)
+    scarf = Product(name="Scarf", quantity=0, price=15.0)
+    db.add_all([tote, scarf, User(username="operator1", hashed_password="x", role="operator")])
+    db.commit()
+
+    start = datetime(2025, 4, 1, 9, 0, 0)
+    statuses = [ProductionStatus.PLANNED, ProductionStatus.IN_PROGRESS, ProductionStatus.COMPLETE]
+    for i in range(9):
+        status = statuses[i % 3]
+        db.add(ProductionOrder(
+            product_id=tote.id if i < 6 else scarf.id,
+            batch_size=i + 1,
+            status=status,
+            # Two orders share each timestamp so the id tie-breaker is exercised
+            created_at=start + timedelta(hours=i // 2),
+            completed_at=start + timedelta(days=1, hours=i) if status == ProductionStatus.COMPLETE else None
+        ))
+    db.commit()
+
+    yield db
+
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+def auth_headers():
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': 'operator1'})}"}
+
+def test_cursor_walks_all_orders_newest_first(db):
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 4}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/production_orders/", params=params, headers=auth_headers())
+        assert response.status_code == 200
+        seen.extend((order["created_at"], order["id"]) for order in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert len(seen) == 9
+    assert seen == sorted(seen, reverse=True)
+
+def test_open_orders_view_reads_only_planned_and_in_progress(db):
+    response = client.get(
+        "/production_orders/",
+        params=[("status", "planned"), ("status", "in_progress")],
+        headers=auth_headers()
+    )
+    assert response.status_code == 200
+    orders = response.json()
+    assert len(orders) == 6
+    assert {order["status"] for order in orders} == {"planned", "in_progress"}
+    assert "X-Next-Cursor" not in response.headers
+
+def test_filters_by_product_and_time_ranges(db):
+    response = client.get(
+        "/production_orders/",
+        params={"product_id": 2, "created_from": "2025-04-01T13:00:00"},
+        headers=auth_headers()
+    )
+    assert [order["id"] for order in response.json()] == [9]
+
+    response = client.get(
+        "/production_orders/",
+        params={"completed_from": "2025-04-02T10:00:00", "completed_to": "2025-04-02T17:00:00"},
+        headers=auth_headers()
+    )
+    assert [order["id"] for order in response.json()] == [6, 3]
+
+def test_rejects_invalid_cursor_and_limit(db):
+    response = client.get("/production_orders/", params={"cursor": "garbage"}, headers=auth_headers())
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+    response = client.get("/production_orders/", params={"limit": 0}, headers=auth_headers())
+    assert response.status_code == 422
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import Base, engine, SessionLocal
+from app.models.location import Location
+from app.models.product import Product
+from app.models.material import Material
+from app.models.bom import BillOfMaterial
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    locations = [Location(name=f"Shelf {i}") for i in range(3)]
+    db.add_all(locations)
+    db.commit()
+    products = [Product(name=f"Product {i}", location_id=locations[i % 3].id) for i in range(8)]
+    materials = [Material(name=f"Material {i}", quantity=10.0) for i in range(6)]
+    db.add_all(products + materials)
+    db.commit()
+    db.add_all([
+        BillOfMaterial(product_id=product.id, material_id=material.id, quantity=1.0)
+        for product in products
+        for material in materials[:4]
+    ])
+    db.commit()
+
+    yield db
+
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+def count_selects(path):
+    statements = []
+
+    def record(*args):
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    # Leave out the ETag version lookup
+    return response.json(), len([sql for sql in statements if "table_versions" not in sql])
+
+def test_bom_list_query_count_is_fixed(db):
+    data, selects = count_selects("/bom/")
+    assert len(data) == 32
+    assert all(row["product"]["location"]["name"].startswith("Shelf") for row in data)
+    assert all(row["material"]["name"].startswith("Material") for row in data)
+    # BoM lines, products with locations, materials
+    assert selects == 3
+
+def test_product_list_query_count_is_fixed(db):
+    data, selects = count_selects("/products/")
+    assert len(data) == 8
+    assert all(product["location"]["name"].startswith("Shelf") for product in data)
+    assert selects == 1
@@ -0,0 +1,109 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import Base, engine, SessionLocal
+from app.models.material import Material
+from app.models.inventory_log import InventoryChangeLog, ChangeType
+from app.models.stock_snapshot import StockSnapshot
+from app.models.user import User
+from app.services.auth_utils import create_access_token
+from app.services.stock_movements import record_ledger_entries
+from app.services.stock_snapshots import stock_as_of, take_snapshot
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    # Thread starts at 10, +40 on Jan 10, -30 on Feb 10, -5 on Mar 10 (final 15)
+    thread = Material(name="Thread", quantity=15.0, unit="spools")
+    untouched = Material(name="Buttons", quantity=7.0, unit="pieces")
+    db.add_all([thread, untouched, User(username="admin1", hashed_password="x", role="admin")])
+    db.commit()
+    db.add_all([
+        InventoryChangeLog(material_id=thread.id, change_type=ChangeType.RESTOCK, quantity=40.0,
+                           remaining=50.0, timestamp=datetime(2025, 1, 10)),
+        InventoryChangeLog(material_id=thread.id, change_type=ChangeType.DEDUCTION, quantity=30.0,
+                           remaining=20.0, timestamp=datetime(2025, 2, 10)),
+        InventoryChangeLog(material_id=thread.id, change_type=ChangeType.DEDUCTION, quantity=5.0,
+                           remaining=15.0, timestamp=datetime(2025, 3, 10)),
+    ])
+    db.commit()
+
+    yield db
+
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+def quantities_by_name(db, quantities):
+    names = dict(db.query(Material.id, Material.name).all())
+    return {names[material_id]: qty for material_id, qty in quantities.items()}
+
+def test_stock_as_of_without_snapshots(db):
+    assert quantities_by_name(db, stock_as_of(db, datetime(2025, 1, 1))) == {"Thread": 10.0, "Buttons": 7.0}
+    assert quantities_by_name(db, stock_as_of(db, datetime(2025, 2, 28))) == {"Thread": 20.0, "Buttons": 7.0}
+    assert quantities_by_name(db, stock_as_of(db, datetime(2025, 4, 1))) == {"Thread": 15.0, "Buttons": 7.0}
+
+def test_snapshots_are_incremental_and_answer_as_of(db):
+    assert take_snapshot(db, datetime(2025, 1, 31)) == 2
+    assert take_snapshot(db, datetime(2025, 1, 31)) == 0
+    assert take_snapshot(db, datetime(2025, 2, 28)) == 2
+
+    feb = db.query(StockSnapshot).filter(StockSnapshot.taken_at == datetime(2025, 2, 28)).all()
+    assert quantities_by_name(db, {s.material_id: s.quantity for s in feb}) == {"Thread": 20.0, "Buttons": 7.0}
+
+    statements = []
+
+    def record(*args):
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        quantities = stock_as_of(db, datetime(2025, 3, 15))
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert quantities_by_name(db, quantities) == {"Thread": 15.0, "Buttons": 7.0}
+    # The snapshot covers every material, so no fallback lookup is needed
+    assert len(statements) == 4
+
+def test_row_committed_after_the_snapshot_is_not_lost(db):
+    thread_id, buttons_id = 1, 2
+    # Ledger ids 1-3 belong to Thread. A Thread deduction gets id 4 but its transaction
+    # commits only after a Buttons restock (id 5) has committed and a snapshot was taken.
+    record_ledger_entries(db, [{"id": 5, "material_id": buttons_id, "change_type": ChangeType.RESTOCK,
+                                "quantity": 3.0, "remaining": 10.0, "timestamp": datetime(2025, 3, 20, 9, 0)}])
+    db.commit()
+    assert take_snapshot(db, datetime(2025, 3, 20, 12, 0)) == 2
+
+    record_ledger_entries(db, [{"id": 4, "material_id": thread_id, "change_type": ChangeType.DEDUCTION,
+                                "quantity": 2.0, "remaining": 13.0, "timestamp": datetime(2025, 3, 20, 8, 0)}])
+    db.commit()
+
+    assert quantities_by_name(db, stock_as_of(db, datetime(2025, 3, 21))) == {"Thread": 13.0, "Buttons": 10.0}
+
+    # The next snapshot folds the late row in and keeps it
+    take_snapshot(db, datetime(2025, 3, 22))
+    assert quantities_by_name(db, stock_as_of(db, datetime(2025, 3, 23))) == {"Thread": 13.0, "Buttons": 10.0}
+
+def test_materials_endpoint_as_of(db):
+    take_snapshot(db, datetime(2025, 1, 31))
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'admin1'})}"}
+
+    response = client.get("/materials/", params={"as_of": "2025-02-15T00:00:00"}, headers=headers)
+    assert response.status_code == 200
+    assert {m["name"]: m["quantity"] for m in response.json()} == {"Thread": 20.0, "Buttons": 7.0}
+
+    current = client.get("/materials/", headers=headers).json()
+    assert {m["name"]: m["quantity"] for m in current} == {"Thread": 15.0, "Buttons": 7.0}
+
+def test_snapshot_endpoint_requires_admin(db):
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'admin1'})}"}
+    response = client.post("/materials/snapshots/", params={"taken_at": "2025-03-31T23:59:59"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["materials"] == 2
+    assert client.post("/materials/snapshots/").status_code == 401